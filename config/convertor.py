@@ -1,20 +1,24 @@
-from config.materials import Material
+from config.materials import MATERIAL_COLORS, Material, get_material_classifier
 from config.room_types import RoomType
 from house.domain import Door, Wall, Window
 
+COLOR_MATERIALS = {color: material for material, color in MATERIAL_COLORS.items()}
+
+PIXEL_MATERIALS = {
+    **COLOR_MATERIALS,
+    **{color + (255,): material for color, material in COLOR_MATERIALS.items()},
+}
+
 
 def pixel_to_material(pixel):
-    materials = {
-        (255, 255, 255): Material.BLANK,
-        (255, 0, 0): Material.DOOR,
-        (0, 0, 255): Material.WINDOW,
-        (0, 0, 0): Material.WALL,
-        (255, 255, 255, 255): Material.BLANK,
-        (255, 0, 0, 255): Material.DOOR,
-        (0, 0, 255, 255): Material.WINDOW,
-        (0, 0, 0, 255): Material.WALL,
-    }
-    return materials.get(pixel) if materials.get(pixel) else Material.BLANK
+    return PIXEL_MATERIALS.get(pixel, Material.BLANK)
+
+
+def image_to_materials(image, tolerance=0):
+    """Converts a decoded image (a PIL image or an array of RGB(A) pixels indexed as [y, x])
+    into an uint8 array of material values indexed as [x, y], like the image itself.
+    """
+    return get_material_classifier(tolerance).classify(image)
 
 
 def material_to_class(material):
@@ -1,2 +1,3 @@
 factor = 50
 output_factor = 2
+color_tolerance = 0
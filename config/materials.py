@@ -1,5 +1,7 @@
 from enum import Enum
 
+import numpy as np
+
 
 class Material(Enum):
     BLANK = 0
@@ -11,3 +13,81 @@ class Material(Enum):
 
 
 STRUCTURES = [Material.WALL, Material.DOOR, Material.WINDOW]
+STRUCTURE_VALUES = [material.value for material in STRUCTURES]
+
+MATERIAL_COLORS = {
+    Material.BLANK: (255, 255, 255),
+    Material.WALL: (0, 0, 0),
+    Material.DOOR: (255, 0, 0),
+    Material.WINDOW: (0, 0, 255),
+}
+
+
+class MaterialClassifier:
+    """Maps pixels to material values through lookup tables compiled once.
+    A colour gets the material whose colour is at most `tolerance` away on every
+    channel; any other colour, and any pixel whose alpha is more than `tolerance`
+    away from opaque, is BLANK. The tolerance must stay under 128 so a colour can't
+    be near two materials at once.
+    """
+
+    def __init__(self, tolerance=0):
+        if not 0 <= tolerance < 128:
+            raise ValueError("The colour tolerance must be between 0 and 127.")
+        self.tolerance = tolerance
+        levels = np.arange(256)
+        self._channels = np.zeros((3, 256), dtype=np.uint8)
+        self._materials = np.full(1 << len(MATERIAL_COLORS), Material.BLANK.value, dtype=np.uint8)
+        for bit, (material, color) in enumerate(MATERIAL_COLORS.items()):
+            for channel in range(3):
+                self._channels[channel, np.abs(levels - color[channel]) <= tolerance] |= 1 << bit
+            self._materials[1 << bit] = material.value
+        self._alpha = np.where(levels >= 255 - tolerance, 0xFF, 0).astype(np.uint8)
+
+    def classify_pixels(self, pixels):
+        """Classifies an array of RGB or RGBA pixels, keeping its layout."""
+        matches = self._channels[0][pixels[..., 0]]
+        matches &= self._channels[1][pixels[..., 1]]
+        matches &= self._channels[2][pixels[..., 2]]
+        if pixels.shape[-1] == 4:
+            matches &= self._alpha[pixels[..., 3]]
+        return self._materials[matches]
+
+    def classify(self, image):
+        """Classifies a PIL image or an array of RGB(A) pixels indexed as [y, x].
+        Palette images are classified through their palette.
+        Returns:
+        The material values, indexed as [x, y].
+        """
+        if isinstance(image, np.ndarray):
+            materials = self.classify_pixels(image)
+        elif image.mode == "P":
+            materials = self.classify_pixels(self._palette_colors(image))[np.asarray(image)]
+        else:
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            materials = self.classify_pixels(np.asarray(image))
+        return np.ascontiguousarray(materials.T)
+
+    @staticmethod
+    def _palette_colors(image):
+        colors = np.zeros((256, 4), dtype=np.uint8)
+        colors[:, 3] = 255
+        palette = np.array(image.getpalette() or list(), dtype=np.uint8).reshape(-1, 3)[:256]
+        colors[:len(palette), :3] = palette
+        transparency = image.info.get("transparency")
+        if isinstance(transparency, int):
+            colors[transparency, 3] = 0
+        elif isinstance(transparency, bytes):
+            alpha = np.frombuffer(transparency, dtype=np.uint8)[:256]
+            colors[:len(alpha), 3] = alpha
+        return colors
+
+
+_classifiers = dict()
+
+
+def get_material_classifier(tolerance=0):
+    if tolerance not in _classifiers:
+        _classifiers[tolerance] = MaterialClassifier(tolerance)
+    return _classifiers[tolerance]
@@ -1,10 +1,19 @@
+from functools import lru_cache
+
 from PIL import Image
 
 from config.directions import Direction
 
 
-def format_image(points, orientation, path):
+@lru_cache(maxsize=None)
+def load_sprite(path):
     img = Image.open(path)
+    img.load()
+    return img
+
+
+def format_image(points, orientation, path):
+    img = load_sprite(path)
     min_point = (min([x for x, y in points]), min([y for x, y in points]))
     height = max([y for x, y in points]) - min_point[1]
     width = max([x for x, y in points]) - min_point[0]
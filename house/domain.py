@@ -1,7 +1,9 @@
+import numpy as np
+
 from config.directions import Direction
 from config.globals import factor
 from maths.domain import Polygon
-from maths.service import convex_decomposition
+from maths.service import PolygonSet, SpatialIndex, convex_decomposition
 
 
 def make_blocker(points, orientation):
@@ -91,11 +93,31 @@ class Door(Structure):
         self.img = None
 
 
+class RoomGraph:
+    def __init__(self, rooms):
+        self.rooms = list(rooms)
+        self.positions = {room.id: position for position, room in enumerate(self.rooms)}
+        self.neighbors = [
+            sorted(self.positions[other_room.id] for other_room in room.connected_rooms) for room in self.rooms
+        ]
+
+    def edges(self):
+        return [(position, other) for position, neighbors in enumerate(self.neighbors)
+                for other in neighbors if position < other]
+
+    def adjacency_matrix(self):
+        matrix = np.zeros((len(self.rooms), len(self.rooms)), dtype=bool)
+        for position, neighbors in enumerate(self.neighbors):
+            matrix[position, neighbors] = True
+        return matrix
+
+
 class House:
     def __init__(self, rooms, width, height):
         self.rooms = rooms
         self.width = width
         self.height = height
+        self.graph = RoomGraph(rooms)
 
 
 class Furniture(Structure):
@@ -106,6 +128,26 @@ class Furniture(Structure):
         self.type = furniture_type
 
 
+class RoomObstacles:
+    """The polygons of a room furniture can't overlap, except for the furniture itself: walls, windows, doors
+    and the blockers in front of doors in blocking, the blockers in front of windows, which only tall furniture
+    can't overlap, in tall_only.
+    """
+
+    def __init__(self, room):
+        self.blocking = PolygonSet(
+            [wall.poly for wall in room.walls] +
+            [window.poly for window in room.windows] +
+            [polygon for door in room.doors for polygon in (door.poly, door.blocker.poly)]
+        )
+        self.tall_only = PolygonSet([window.blocker.poly for window in room.windows])
+
+    def collide(self, furniture):
+        if self.blocking.collides(furniture.poly):
+            return True
+        return bool(furniture.is_tall) and self.tall_only.collides(furniture.poly)
+
+
 class Room(Structure):
     def __init__(self, id, origin, farthest_point, walls, doors, windows, area, points, orientation):
         super().__init__(points, orientation)
@@ -122,10 +164,35 @@ class Room(Structure):
         self.blockers = list()
         self.decomposed_parts = list()
         self.furniture = list()
+        self._obstacles = None
+        self._furniture_index = None
 
     def _convex_decompose(self):
         self.decomposed_parts = convex_decomposition(self.poly)
 
+    @property
+    def obstacles(self):
+        """The obstacles of the room that never change, compiled on first use and then shared by every
+        placement attempt and every furnishing of the room.
+        """
+        if self._obstacles is None:
+            self._obstacles = RoomObstacles(self)
+        return self._obstacles
+
+    @property
+    def furniture_index(self):
+        """Spatial index of the furniture of the room, kept up to date by add_furniture."""
+        if self._furniture_index is None:
+            self._furniture_index = SpatialIndex(factor)
+            for furniture in self.furniture:
+                self._furniture_index.insert(furniture.poly, furniture.poly)
+        return self._furniture_index
+
+    def add_furniture(self, furniture):
+        self.furniture.append(furniture)
+        if self._furniture_index is not None:
+            self._furniture_index.insert(furniture.poly, furniture.poly)
+
     def __eq__(self, other):
         return self.id == other.id
 
@@ -0,0 +1,144 @@
+import numpy as np
+
+from config.room_types import RoomType
+from house.domain import RoomGraph
+
+# the order in which the room types are compared when looking for the most common one
+COUNT_ORDER = [RoomType.KITCHEN, RoomType.BEDROOM, RoomType.BATHROOM, RoomType.HALL, RoomType.LIVINGROOM]
+
+
+class RoomFeatures:
+    """What the room type rules need to know about the rooms, as arrays indexed by room position."""
+
+    def __init__(self, rooms):
+        self.ids = [room.id for room in rooms]
+        self.areas = np.array([room.area for room in rooms], dtype=float)
+        self.area_average = sum(room.area for room in rooms) / len(rooms) if len(rooms) else 0
+        self.windows = np.array([len(room.windows) for room in rooms], dtype=np.int64)
+        self.doors = np.array([len(room.doors) for room in rooms], dtype=np.int64)
+        self.degrees = np.array([len(room.connected_rooms) for room in rooms], dtype=np.int64)
+        self.adjacency = RoomGraph(rooms).adjacency_matrix()
+
+
+class RoomTypesFitness:
+    """Scores whole populations of room type assignments at once.
+    A population is an integer array with one row per chromosome and one column per
+    room, holding RoomType values. The score of a chromosome is the sum of a score
+    per room for its own type, a score per pair of connected rooms for their types
+    and a score for how many rooms of every type there are.
+    """
+
+    def __init__(self, features):
+        self.features = features
+        degrees = features.degrees
+        smaller = features.areas < features.area_average
+        larger = features.areas > features.area_average
+
+        self.room_scores = np.zeros((len(features.ids), len(RoomType)), dtype=np.int64)
+        self.room_scores[:, RoomType.BATHROOM.value] = (
+                degrees * (-800 * features.windows + np.where(smaller, 300, -200)) - 300 * degrees
+        )
+        self.room_scores[:, RoomType.KITCHEN.value] = -300 * degrees
+        self.room_scores[:, RoomType.BEDROOM.value] = degrees * np.where(larger, 300, 0)
+        self.room_scores[:, RoomType.HALL.value] = (
+                np.where(features.doors == 1, -1000, 0) +
+                np.where(features.doors > degrees, 600, 0) +
+                600 * features.doors
+        )
+
+        # bathrooms lose 300 and kitchens 300 per neighbour already, these are the gains on top
+        self.pair_scores = np.zeros((len(RoomType), len(RoomType)), dtype=np.int64)
+        self.pair_scores[RoomType.BATHROOM.value, RoomType.BEDROOM.value] = 600
+        self.pair_scores[RoomType.BATHROOM.value, RoomType.HALL.value] = 600
+        self.pair_scores[RoomType.KITCHEN.value, RoomType.LIVINGROOM.value] = 700
+        self.pair_scores[RoomType.KITCHEN.value, RoomType.HALL.value] = 400
+
+        self.sources, self.targets = np.nonzero(features.adjacency)
+        # plain lists for evaluate_delta, which only looks at a few rooms at a time
+        self._room_score_rows = self.room_scores.tolist()
+        self._pair_score_rows = self.pair_scores.tolist()
+        self._neighbors = [np.flatnonzero(row).tolist() for row in features.adjacency]
+        self._positions = np.arange(len(features.ids))
+        self._types = np.array([room_type.value for room_type in RoomType])
+        self._count_order = np.array([room_type.value for room_type in COUNT_ORDER])
+
+    def count_scores(self, counts):
+        """Scores the number of rooms of every type, counts being indexed by RoomType value."""
+        present = counts > 0
+        scores = 300 * present.sum(axis=-1)
+        ordered = counts[..., self._count_order]
+        most_common = self._count_order[np.argmax(ordered, axis=-1)]
+        scores += np.where((ordered.max(axis=-1) > 0) & (most_common == RoomType.BEDROOM.value), 600, 0)
+        scores -= 600 * ~present[..., RoomType.BATHROOM.value]
+        scores -= 800 * ~present[..., RoomType.BEDROOM.value]
+        scores -= 400 * ~present[..., RoomType.KITCHEN.value]
+        scores -= np.where(
+            present[..., RoomType.HALL.value] &
+            (~present[..., RoomType.BEDROOM.value] | ~present[..., RoomType.KITCHEN.value]),
+            1000,
+            0,
+        )
+        return scores
+
+    def count_score(self, counts):
+        """Same as count_scores for the counts of a single chromosome, as a list."""
+        score = 0
+        most_common, max_count = None, 0
+        for room_type in COUNT_ORDER:
+            if counts[room_type.value] > max_count:
+                most_common, max_count = room_type, counts[room_type.value]
+        for count in counts:
+            score += 300 if count > 0 else 0
+        score += 600 if most_common == RoomType.BEDROOM else 0
+        score -= 600 if not counts[RoomType.BATHROOM.value] else 0
+        score -= 800 if not counts[RoomType.BEDROOM.value] else 0
+        score -= 400 if not counts[RoomType.KITCHEN.value] else 0
+        if counts[RoomType.HALL.value] and not (counts[RoomType.BEDROOM.value] and counts[RoomType.KITCHEN.value]):
+            score -= 1000
+        return score
+
+    def evaluate_delta(self, parent, parent_fitness, child, parent_counts=None):
+        """Scores a chromosome from the score of a chromosome it differs from in a few rooms.
+        Only the scores of the changed rooms, of the connections they are part of and of the
+        type counts are computed again. Finding the changed rooms, reading both chromosomes and,
+        without parent_counts, counting the parent's types still take a pass over every room.
+        Keyword arguments:
+        parent -- chromosome whose fitness is known
+        parent_fitness -- fitness of the parent
+        child -- chromosome to score
+        parent_counts -- number of rooms of every type in the parent, computed when not given
+        Returns:
+        The fitness of the child.
+        """
+        changed = np.flatnonzero(np.not_equal(parent, child)).tolist()
+        if not changed:
+            return parent_fitness
+        parent_types, child_types = np.asarray(parent).tolist(), np.asarray(child).tolist()
+        if parent_counts is None:
+            parent_counts = np.bincount(parent_types, minlength=len(RoomType)).tolist()
+        counts = list(parent_counts)
+        changed_rooms = set(changed)
+        pair_scores = self._pair_score_rows
+        fitness = parent_fitness
+        for room in changed:
+            old, new = parent_types[room], child_types[room]
+            fitness += self._room_score_rows[room][new] - self._room_score_rows[room][old]
+            for neighbor in self._neighbors[room]:
+                # connections between two changed rooms are only counted once
+                if neighbor in changed_rooms and neighbor < room:
+                    continue
+                old_neighbor, new_neighbor = parent_types[neighbor], child_types[neighbor]
+                fitness += pair_scores[new][new_neighbor] + pair_scores[new_neighbor][new]
+                fitness -= pair_scores[old][old_neighbor] + pair_scores[old_neighbor][old]
+            counts[old] -= 1
+            counts[new] += 1
+        return fitness + self.count_score(counts) - self.count_score(parent_counts)
+
+    def evaluate(self, population):
+        population = np.asarray(population, dtype=np.int64)
+        if population.ndim == 1:
+            population = population[np.newaxis]
+        fitness = self.room_scores[self._positions, population].sum(axis=1)
+        fitness += self.pair_scores[population[:, self.sources], population[:, self.targets]].sum(axis=1)
+        fitness += self.count_scores((population[..., None] == self._types).sum(axis=1))
+        return fitness
@@ -1,16 +1,17 @@
 import json
-import random
 from collections import defaultdict
-from numpy.random import choice
+
+import numpy as np
+
 from config.convertor import room_type_to_json_room
 
 
 class FurnitureManager:
-    def __init__(self, furniture_config_file="furniture_config.json", room_config_file="room_config.json"):
+    def __init__(self, furniture_config_file="furniture_config.json", room_config_file="room_config.json", rng=None):
         self._furniture_config = self._load_json(furniture_config_file)
         self._room_config = self._load_json(room_config_file)
         self._given_furniture = defaultdict(lambda: 0)
-        self.rand = random.SystemRandom()
+        self.rand = np.random.default_rng() if rng is None else rng
 
     def _load_json(self, file):
         with open(file) as json_file:
@@ -31,6 +32,9 @@ class FurnitureManager:
     def get_window_image(self):
         return self._furniture_config.get("window").get("src")
 
+    def get_images(self):
+        return sorted({furniture.get("src") for furniture in self._furniture_config.values() if furniture.get("src")})
+
     def get_random_furniture(self, room_type):
         try:
             furniture = self._room_config.get(room_type_to_json_room(room_type))
@@ -63,9 +67,9 @@ class FurnitureManager:
             if fitness_sum == 0:
                 return None
             unit = 1 / fitness_sum
-            draw = choice(furniture_configs, 1,
-                          p=[furniture.get("fitness") * unit for furniture in furniture_configs])
-            return draw.tolist()[0]
+            draw = self.rand.choice(len(furniture_configs),
+                                    p=[furniture.get("fitness") * unit for furniture in furniture_configs])
+            return furniture_configs[draw]
         except TypeError:
             return None
 
@@ -1,135 +1,128 @@
 import math
-import random
-from copy import deepcopy
-from datetime import datetime
+from collections import defaultdict
+
+import numpy as np
 
 from config.directions import Direction
 from config.globals import factor, output_factor
 from config.room_types import RoomType
 from house.domain import Room, Furniture, House
+from house.fitness import RoomFeatures, RoomTypesFitness
+from house.solutions import get_signature
 from house.furniture_manager import FurnitureManager, ConfigurationError
-from maths.service import check_collision_concave, check_collision, rotate
-from utils.genetic_algorithm import GeneticAlgorithm
+from maths.service import OccupancyGrid, check_collision_concave, check_collision, get_bounds, rotate
+from utils.genetic_algorithm import GeneticAlgorithm, StopReason
 
 
 def get_points(door, room, index):
     return door.points[index][0] + room.origin[0], door.points[index][1] + room.origin[1]
 
 
+def get_door_footprint(door, room):
+    return frozenset(get_points(door, room, index) for index in range(4))
+
+
 def set_connected_rooms(rooms):
+    rooms_by_footprint = defaultdict(list)
     for room in rooms:
-        for other_room in rooms:
-            if room != other_room:
-                for door in room.doors:
-                    for other_door in other_room.doors:
-                        if set(
-                                [get_points(door, room, index) for index in range(4)]
-                        ) == set(
-                            [get_points(other_door, other_room, index) for index in range(4)]
-                        ):
-                            room.connected_rooms.add(other_room)
-                            other_room.connected_rooms.add(room)
+        for door in room.doors:
+            rooms_by_footprint[get_door_footprint(door, room)].append(room)
+    for door_rooms in rooms_by_footprint.values():
+        for room in door_rooms:
+            for other_room in door_rooms:
+                if room != other_room:
+                    room.connected_rooms.add(other_room)
 
     return rooms
 
 
 class RoomTypesGa(GeneticAlgorithm):
+    """Chooses the type of every room.
+    Chromosomes are int8 arrays holding the RoomType value of every room, in the
+    order of the rooms; to_room_types turns one into the room id to RoomType
+    mapping the rest of the code uses.
+    """
+
     def __init__(self, no_generations, no_chromosomes, rooms, **kwargs):
         super().__init__(no_generations, no_chromosomes, **kwargs)
-        self._rooms = rooms
+        self._room_ids = [room.id for room in rooms]
+        self._fitness = RoomTypesFitness(RoomFeatures(rooms))
+        self.signature = get_signature(self._fitness.features)
+        self._type_values = np.array([room_type.value for room_type in RoomType], dtype=np.int8)
+
+    def to_room_types(self, chromosome):
+        return {id: RoomType(int(value)) for id, value in zip(self._room_ids, chromosome)}
+
+    def from_room_types(self, room_types):
+        return np.array([room_types[id].value for id in self._room_ids], dtype=np.int8)
+
+    def _random_types(self, shape):
+        return self._type_values[self.rand.integers(len(self._type_values), size=shape)]
 
     def mutate(self, chromosome):
-        new_chromosome = dict()
-        for i in self._rooms:
-            new_chromosome[i.id] = chromosome[i.id]
-            new_type = self.rand.choice(list(RoomType))
-            to_mutate_element = self.rand.random() <= self.mutation_area
-            if to_mutate_element:
-                new_chromosome[i.id] = new_type
-        return new_chromosome
+        to_mutate = self.rand.random(len(self._room_ids)) <= self.mutation_area
+        return np.where(to_mutate, self._random_types(len(self._room_ids)), chromosome)
 
     def crossover(self, chromosome1, chromosome2):
-        new_chromosome = dict()
-        for i in self._rooms:
-            which = self.rand.random()
-            new_chromosome[i.id] = deepcopy(chromosome1[i.id] if which >= 0.2 else chromosome2[i.id])
-        return new_chromosome
+        return np.where(self.rand.random(len(self._room_ids)) >= 0.2, chromosome1, chromosome2)
+
+    def chromosome_key(self, chromosome):
+        return chromosome.tobytes()
 
     def get_fitness(self, chromosome):
-        fitness = 0
-        room_area_avg = 0
-        for room in self._rooms:
-            room_area_avg += room.area
-        room_area_avg = room_area_avg / len(self._rooms) if len(self._rooms) else 0
-        room_types = {
-            RoomType.KITCHEN: 0,
-            RoomType.BEDROOM: 0,
-            RoomType.BATHROOM: 0,
-            RoomType.HALL: 0,
-            RoomType.LIVINGROOM: 0,
-        }
-        for room in self._rooms:
-            for neighbor in room.connected_rooms:
-                if chromosome[room.id] == RoomType.BATHROOM:
-                    fitness -= 800 * len(room.windows)
-                    if room_area_avg > room.area:
-                        fitness += 300
-                    else:
-                        fitness -= 200
-                    if chromosome[neighbor.id] == RoomType.BEDROOM or chromosome[neighbor.id] == RoomType.HALL:
-                        fitness += 300
-                    elif (
-                            chromosome[neighbor.id] == RoomType.LIVINGROOM or
-                            chromosome[neighbor.id] == RoomType.KITCHEN or
-                            chromosome[neighbor.id] == RoomType.BATHROOM
-                    ):
-                        fitness -= 300
-                elif chromosome[room.id] == RoomType.KITCHEN:
-                    if chromosome[neighbor.id] == RoomType.LIVINGROOM:
-                        fitness += 400
-                    elif chromosome[neighbor.id] == RoomType.HALL:
-                        fitness += 100
-                    else:
-                        fitness -= 300
-                elif chromosome[room.id] == RoomType.BEDROOM:
-                    if room_area_avg < room.area:
-                        fitness += 300
-            if chromosome[room.id] == RoomType.HALL:
-                if len(room.doors) == 1:
-                    fitness -= 1000
-                if len(room.doors) > len(room.connected_rooms):
-                    fitness += 600
-                fitness += 600 * len(room.doors)
-            room_types[chromosome[room.id]] += 1
-        max_count = 0
-        max_room_type = None
-        for room_type, count in room_types.items():
-            if count > 0:
-                fitness += 300
-            if count > max_count:
-                max_count = count
-                max_room_type = room_type
-        if room_types[RoomType.BATHROOM] == 0:
-            fitness -= 600
-        if room_types[RoomType.BEDROOM] == 0:
-            fitness -= 800
-        if room_types[RoomType.KITCHEN] == 0:
-            fitness -= 400
-        if max_room_type == RoomType.BEDROOM:
-            fitness += 600
-        if room_types[RoomType.HALL] > 0 and (room_types[RoomType.BEDROOM] == 0 or room_types[
-            RoomType.KITCHEN] == 0 or RoomType.BATHROOM == 0 or RoomType.LIVINGROOM == 0):
-            fitness -= 1000
-        return fitness
+        return self.get_fitnesses([chromosome])[0]
+
+    def get_child_fitness(self, child, parent, parent_fitness):
+        return self._fitness.evaluate_delta(parent, parent_fitness, child)
+
+    def get_fitnesses(self, chromosomes):
+        return self._fitness.evaluate(np.reshape(chromosomes, (len(chromosomes), len(self._room_ids)))).tolist()
 
     def get_random_chromosome(self):
-        new_chromosome = dict()
-        for i in self._rooms:
-            new_chromosome[i.id] = self.rand.choice(list(RoomType))
-        return new_chromosome
+        return self._random_types(len(self._room_ids))
 
+    def get_random_chromosomes(self, count):
+        return list(self._random_types((count, len(self._room_ids))))
 
-def set_rooms_types(rooms):
+
+class RoomTypesSolver(RoomTypesGa):
+    """Same as RoomTypesGa, except that houses having at most max_assignments possible room type
+    assignments get all of them scored, batch_size at a time, and the best one returned.
+    """
+
+    def __init__(self, no_generations, no_chromosomes, rooms, max_assignments=len(RoomType) ** 8, batch_size=65536,
+                 **kwargs):
+        super().__init__(no_generations, no_chromosomes, rooms, **kwargs)
+        self.exhaustive = len(self._type_values) ** len(self._room_ids) <= max_assignments
+        self.batch_size = batch_size
+
+    def _get_assignments(self, start, stop):
+        indexes = np.arange(start, stop, dtype=np.int64)[:, np.newaxis]
+        powers = len(self._type_values) ** np.arange(len(self._room_ids), dtype=np.int64)
+        return self._type_values[indexes // powers % len(self._type_values)]
+
+    def run(self):
+        if not self.exhaustive:
+            return super().run()
+        for observer in self.observers:
+            observer.on_start(self)
+        count = len(self._type_values) ** len(self._room_ids)
+        best, self.best_fitness = None, None
+        for start in range(0, count, self.batch_size):
+            assignments = self._get_assignments(start, min(start + self.batch_size, count))
+            fitnesses = self._fitness.evaluate(assignments)
+            index = int(np.argmax(fitnesses))
+            if self.best_fitness is None or fitnesses[index] > self.best_fitness:
+                best, self.best_fitness = assignments[index], int(fitnesses[index])
+        self.generations = 0
+        self.stop_reason = StopReason.EXHAUSTED
+        for observer in self.observers:
+            observer.on_stop(self)
+        return best
+
+
+def set_rooms_types(rooms, rng=None):
+    rand = np.random.default_rng() if rng is None else rng
     room_area_avg = 0
     for room in rooms:
         room_area_avg += room.area
@@ -173,14 +166,13 @@ def set_rooms_types(rooms):
 
         if RoomType.LIVINGROOM in fixed_rooms:
             livingroom -= 300
-        rand = random.Random(datetime.now())
 
         kitchen = kitchen if kitchen > 0 else 1
         bathroom = bathroom if bathroom > 0 else 1
         bedroom = bedroom if bedroom > 0 else 1
         hall = hall if hall > 0 else 1
         livingroom = livingroom if livingroom > 0 else 1
-        room_type_number = rand.randrange(kitchen + bathroom + bedroom + hall + livingroom)
+        room_type_number = rand.integers(kitchen + bathroom + bedroom + hall + livingroom)
         if room_type_number < kitchen:
             fixed_rooms.append(RoomType.KITCHEN)
             room.type = RoomType.KITCHEN
@@ -198,27 +190,67 @@ def set_rooms_types(rooms):
             room.type = RoomType.LIVINGROOM
 
 
+def sample_rooms_types(rooms, count, rng=None):
+    """Returns count room id to RoomType mappings drawn by set_rooms_types, leaving the room types unchanged."""
+    if not rooms:
+        return [dict() for _ in range(count)]
+    types = [room.type for room in rooms]
+    samples = list()
+    for _ in range(count):
+        set_rooms_types(rooms, rng)
+        samples.append({room.id: room.type for room in rooms})
+    for room, room_type in zip(rooms, types):
+        room.type = room_type
+    return samples
+
+
+def warm_start_rooms_types(room_type_ga, rooms, store=None, samples=4):
+    """Starts the room types search from the assignments the store kept for houses with the same structure
+    and from samples of set_rooms_types.
+    """
+    chromosomes = store.get(room_type_ga.signature) if store is not None else list()
+    for room_types in sample_rooms_types(rooms, samples, room_type_ga.rand):
+        chromosomes.append(room_type_ga.from_room_types(room_types))
+    room_type_ga.warm_start(chromosomes)
+
+
 def can_place_furniture(furniture, room):
-    for wall in room.walls:
-        if check_collision(wall.poly, furniture.poly):
-            return False
-    for window in room.windows:
-        if check_collision(window.poly, furniture.poly):
-            return False
-        if check_collision(window.blocker.poly, furniture.poly) and furniture.is_tall:
-            return False
-    for door in room.doors:
-        if check_collision(door.poly, furniture.poly) or check_collision(door.blocker.poly, furniture.poly):
-            return False
-    for other_furniture in room.furniture:
-        if check_collision(furniture.poly, other_furniture.poly):
+    if room.obstacles.collide(furniture):
+        return False
+    for polygon in room.furniture_index.query(furniture.poly):
+        if check_collision(polygon, furniture.poly):
             return False
     return not check_collision_concave(room.decomposed_parts, furniture.poly)
 
 
+RANDOM_PLACEMENT = "random"
+GRID_PLACEMENT = "grid"
+PLACEMENTS = (RANDOM_PLACEMENT, GRID_PLACEMENT)
+# furniture sizes are multiples of a tenth of factor, cells of a whole factor would leave too much space unused
+GRID_CELL_SIZE = factor / 5
+
+
 class Furnisher:
-    def __init__(self, furniture_manager: FurnitureManager):
+    def __init__(self, furniture_manager: FurnitureManager, rng=None, placement=RANDOM_PLACEMENT):
+        """The furnisher draws from the random generator of the furniture manager, rng replacing it when given.
+        Keyword arguments:
+        placement -- RANDOM_PLACEMENT tries furniture at random points along the walls and windows,
+        GRID_PLACEMENT chooses among the free places an occupancy grid of the room finds for it
+        """
+        if placement not in PLACEMENTS:
+            raise ValueError(f"Unknown furniture placement {placement!r}, expected one of {PLACEMENTS}")
         self._furniture_manager = furniture_manager
+        self.placement = placement
+        if rng is not None:
+            furniture_manager.rand = rng
+
+    @property
+    def rand(self):
+        return self._furniture_manager.rand
+
+    def seed(self, seed):
+        """Restarts the random draws from the given seed (anything numpy.random.default_rng accepts)."""
+        self._furniture_manager.rand = np.random.default_rng(seed)
 
     def _place_near_the_structure(self, structure, room):
         inner_margin = structure.inner_margin
@@ -228,22 +260,19 @@ class Furnisher:
             if inner_margin[0][0] == inner_margin[1][0]:
                 point = (
                     inner_margin[0][0],
-                    self._furniture_manager.rand.random() * (inner_margin[1][1] - inner_margin[0][1]) +
+                    self.rand.random() * (inner_margin[1][1] - inner_margin[0][1]) +
                     inner_margin[0][1]
                 )
             else:
                 point = (
-                    self._furniture_manager.rand.random() * (inner_margin[1][0] - inner_margin[0][0]) +
+                    self.rand.random() * (inner_margin[1][0] - inner_margin[0][0]) +
                     inner_margin[0][0],
                     inner_margin[1][1]
                 )
 
             self._try_to_place(point, room, structure.orientation)
 
-    def _try_to_place(self, point, room, direction):
-        new_object_config = self._furniture_manager.get_random_furniture(room.type)
-        if not new_object_config:
-            return False
+    def _make_furniture(self, new_object_config, point, direction):
         try:
             width = float(new_object_config.get("width"))
             height = float(new_object_config.get("height"))
@@ -268,22 +297,91 @@ class Furnisher:
         else:
             points = [rotate(points[0], point, 3 * math.pi / 2) for point in points]
             points = [(point[0] + 2, point[1]) for point in points]
-        new_object = Furniture(points=points, orientation=direction, img=new_object_config.get("src"),
-                               is_tall=new_object_config.get("is_tall"), furniture_type=new_object_config.get("type"))
+        return Furniture(points=points, orientation=direction, img=new_object_config.get("src"),
+                         is_tall=new_object_config.get("is_tall"), furniture_type=new_object_config.get("type"))
+
+    def _place(self, new_object, room):
+        self._furniture_manager.furniture_placed(new_object.type)
+        room.add_furniture(new_object)
+
+    def _try_to_place(self, point, room, direction):
+        new_object_config = self._furniture_manager.get_random_furniture(room.type)
+        if not new_object_config:
+            return False
+        new_object = self._make_furniture(new_object_config, point, direction)
         if can_place_furniture(new_object, room):
-            self._furniture_manager.furniture_placed(new_object.type)
-            room.furniture.append(new_object)
+            self._place(new_object, room)
+
+    @staticmethod
+    def _get_occupancy_grids(room):
+        """Returns the occupancy grids of what blocks all furniture in the room and of what only blocks tall
+        furniture, over the bounds of the obstacles of the room.
+        """
+        obstacles = room.obstacles
+        bounds = np.concatenate([obstacles.blocking.bounds, obstacles.tall_only.bounds])
+        if not len(bounds):
+            bounds = np.array([[*np.min(room.points, axis=0), *np.max(room.points, axis=0)]], dtype=float)
+        extent = (*bounds[:, :2].min(axis=0).tolist(), *bounds[:, 2:].max(axis=0).tolist())
+        grid, tall_grid = OccupancyGrid(extent, GRID_CELL_SIZE), OccupancyGrid(extent, GRID_CELL_SIZE)
+        grid.fill(obstacles.blocking.bounds)
+        grid.fill([get_bounds(furniture.poly) for furniture in room.furniture])
+        tall_grid.fill(obstacles.tall_only.bounds)
+        return grid, tall_grid
+
+    def _fill_along_the_structure(self, structure, room, grids):
+        """Draws one piece of furniture for every cell along the inner margin of the structure, each one being
+        placed at one of the free places the grids find for it, at random, or skipped when there is none.
+        Places are tried one unit after the start of every cell, so that the furniture doesn't touch the
+        obstacles ending there, and keep the point the furniture is drawn from on the inner margin.
+        """
+        inner_margin = structure.inner_margin
+        axis = 1 if inner_margin[0][0] == inner_margin[1][0] else 0
+        start, end = sorted((inner_margin[0][axis], inner_margin[1][axis]))
+        grid, tall_grid = grids
+        for _ in range(int((end - start) / factor)):
+            new_object_config = self._furniture_manager.get_random_furniture(room.type)
+            if not new_object_config:
+                return
+            new_object = self._make_furniture(new_object_config, tuple(inner_margin[0]), structure.orientation)
+            box = np.array(get_bounds(new_object.poly))
+            offset = box[axis] - inner_margin[0][axis] - 1
+            cells = np.arange(math.ceil((start + offset) / GRID_CELL_SIZE),
+                              math.floor((end + offset) / GRID_CELL_SIZE) + 1)
+            shifts = cells * GRID_CELL_SIZE - offset - inner_margin[0][axis]
+            boxes = np.repeat(box[np.newaxis], len(shifts), axis=0)
+            boxes[:, [axis, axis + 2]] += shifts[:, np.newaxis]
+            free = grid.are_free(boxes)
+            if new_object.is_tall:
+                free &= tall_grid.are_free(boxes)
+            shifts = shifts[free]
+            if not len(shifts):
+                continue
+            shift = [0.0, 0.0]
+            shift[axis] = float(shifts[self.rand.integers(len(shifts))])
+            new_object = Furniture(points=[(x + shift[0], y + shift[1]) for x, y in new_object.points],
+                                   orientation=new_object.orientation, img=new_object.img,
+                                   is_tall=new_object.is_tall, furniture_type=new_object.type)
+            if can_place_furniture(new_object, room):
+                self._place(new_object, room)
+                grid.fill([get_bounds(new_object.poly)])
 
     def furnish_room(self, room: Room):
         self._furniture_manager.reset_room_resources()
+        grids = self._get_occupancy_grids(room) if self.placement == GRID_PLACEMENT else None
         for door in room.doors:
             door.img = self._furniture_manager.get_door_image()
         for window in room.windows:
             window.img = self._furniture_manager.get_window_image()
-            self._place_near_the_structure(window, room)
+            if grids:
+                self._fill_along_the_structure(window, room, grids)
+            else:
+                self._place_near_the_structure(window, room)
 
         for wall in room.walls:
-            self._place_near_the_structure(wall, room)
+            if grids:
+                self._fill_along_the_structure(wall, room, grids)
+            else:
+                self._place_near_the_structure(wall, room)
 
     def furnish_house(self, house: House):
         for room in house.rooms:
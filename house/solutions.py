@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+def get_signature(features):
+    """Identifies the structure of a house: its number of rooms, their areas and which rooms are connected.
+    Rooms are taken in the order of the features, the one the Processor finds them in.
+    """
+    edges = np.argwhere(np.triu(features.adjacency)).tolist()
+    data = json.dumps([len(features.ids), features.areas.tolist(), edges])
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class RoomTypesStore:
+    """Best room type assignments found so far, max_solutions of them for every house signature.
+    Assignments are lists of RoomType values in room order. When a path is given the store is
+    loaded from it and save writes it back, save_changes only when solutions were added since.
+    """
+
+    def __init__(self, path=None, max_solutions=4):
+        self.path = path
+        self.max_solutions = max_solutions
+        self._solutions = dict()
+        self._lock = threading.Lock()
+        self._changed = False
+        self._saved_at = float("-inf")
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                self._solutions = json.load(file)
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def get(self, signature):
+        """Returns the assignments kept for the signature as int8 arrays, the best one first."""
+        with self._lock:
+            solutions = list(self._solutions.get(signature, ()))
+        return [np.array(chromosome, dtype=np.int8) for _, chromosome in solutions]
+
+    def add(self, signature, chromosome, fitness):
+        chromosome = np.asarray(chromosome).tolist()
+        with self._lock:
+            solutions = [solution for solution in self._solutions.get(signature, ()) if solution[1] != chromosome]
+            solutions.append([fitness, chromosome])
+            solutions.sort(key=lambda solution: solution[0], reverse=True)
+            solutions = solutions[:self.max_solutions]
+            if solutions != self._solutions.get(signature):
+                self._solutions[signature] = solutions
+                self._changed = True
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self._solutions)
+            self._changed = False
+            self._saved_at = time.monotonic()
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w") as file:
+            file.write(data)
+        os.replace(temporary_path, self.path)
+
+    def save_changes(self, interval=0):
+        """Saves the store if solutions were added since the last save, which happened at least interval
+        seconds ago.
+        """
+        with self._lock:
+            due = self._changed and time.monotonic() - self._saved_at >= interval
+        if due:
+            self.save()
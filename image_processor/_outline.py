@@ -0,0 +1,49 @@
+from bisect import bisect_right
+
+import numpy as np
+
+
+class _Lines:
+    """Run-length encoding of cells sorted by line (fixed) and by position on the line (moving)."""
+
+    def __init__(self, fixed, moving, codes, size):
+        new_run = np.ones(len(fixed), dtype=bool)
+        new_run[1:] = (fixed[1:] != fixed[:-1]) | (moving[1:] != moving[:-1] + 1) | (codes[1:] != codes[:-1])
+        starts = np.flatnonzero(new_run)
+        ends = np.append(starts[1:], len(fixed)) - 1
+        self._size = size
+        self._keys = (fixed[starts] * size + moving[starts]).tolist()
+        self._ends = (fixed[ends] * size + moving[ends]).tolist()
+        self._codes = codes[starts].tolist()
+
+    def find(self, line, position, step):
+        key = line * self._size + position
+        run = bisect_right(self._keys, key) - 1
+        if run < 0 or self._ends[run] < key:
+            return None
+        return self._codes[run], (self._ends[run] - key + 1 if step > 0 else key - self._keys[run] + 1)
+
+
+class _BorderRuns:
+    """Runs of equal values among the given cells of a grid, both along its rows
+    (fixed i) and along its columns (fixed j).
+    """
+
+    def __init__(self, codes, cells):
+        self._width, self._height = width, height = cells.shape
+        xs, ys = np.nonzero(cells)
+        self._by_i = _Lines(xs, ys, codes[xs, ys], height)
+        ys, xs = np.nonzero(cells.T)
+        self._by_j = _Lines(ys, xs, codes[xs, ys], width)
+
+    def find(self, i, j, direction):
+        """Looks up the run holding the cell (i, j) along the direction.
+        Returns:
+        The value of the run and how many of its cells are left when stepping in the
+        direction, the cell (i, j) included, or None if the cell isn't part of a run.
+        """
+        if not (0 <= i < self._width and 0 <= j < self._height):
+            return None
+        if direction[0]:
+            return self._by_j.find(j, i, direction[0])
+        return self._by_i.find(i, j, direction[1])
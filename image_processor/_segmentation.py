@@ -0,0 +1,115 @@
+import numpy as np
+
+from config.materials import Material
+
+
+class Region:
+    def __init__(self, label, first, area, bbox):
+        self.label = label
+        self.first = first
+        self.area = area
+        self.bbox = bbox
+
+
+def _blank_runs(blank):
+    """Run-length encodes the blank pixels of every column of the schema.
+    Keyword arguments:
+    blank -- boolean array indexed as [x, y]
+    Returns:
+    The column, the first y and the end y (exclusive) of every run, in scan order.
+    """
+    width, height = blank.shape
+    padded = np.zeros((width, height + 2), dtype=np.int8)
+    padded[:, 1:-1] = blank
+    steps = np.diff(padded, axis=1)
+    columns, starts = np.nonzero(steps == 1)
+    _, ends = np.nonzero(steps == -1)
+    return columns, starts, ends
+
+
+def _find(parent, run):
+    while parent[run] != run:
+        parent[run] = parent[parent[run]]
+        run = parent[run]
+    return run
+
+
+def _link_runs(columns, starts, ends, width):
+    """Joins the runs of neighbouring columns that touch each other (4-connectivity).
+    Every run ends up pointing to the first run of its region in scan order.
+    """
+    parent = list(range(len(columns)))
+    bounds = np.searchsorted(columns, np.arange(width + 1)).tolist()
+    starts, ends = starts.tolist(), ends.tolist()
+    for column in range(1, width):
+        a, a_end = bounds[column - 1], bounds[column]
+        b, b_end = bounds[column], bounds[column + 1]
+        while a < a_end and b < b_end:
+            if starts[a] < ends[b] and starts[b] < ends[a]:
+                root_a, root_b = _find(parent, a), _find(parent, b)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+            if ends[a] < ends[b]:
+                a += 1
+            else:
+                b += 1
+    return [_find(parent, run) for run in range(len(parent))]
+
+
+def _dilate(mask):
+    """Binary dilation of the mask with a 3x3 square (8-connectivity)."""
+    width, height = mask.shape
+    padded = np.zeros((width + 2, height + 2), dtype=bool)
+    padded[1:-1, 1:-1] = mask
+    columns = padded[:-2] | padded[1:-1] | padded[2:]
+    return columns[:, :-2] | columns[:, 1:-1] | columns[:, 2:]
+
+
+def _segment(schema):
+    """Labels every blank area of the schema (the outdoor and the rooms) in a single pass.
+    Keyword arguments:
+    schema -- array of material values indexed as [x, y]
+    Returns:
+    The label of every pixel (0 for non blank pixels) and the regions ordered by
+    their first pixel in scan order, the region labelled i being at index i - 1.
+    """
+    width, height = schema.shape
+    labels = np.zeros((width, height), dtype=np.int32)
+    columns, starts, ends = _blank_runs(schema == Material.BLANK.value)
+    if not len(columns):
+        return labels, list()
+
+    roots = np.array(_link_runs(columns, starts, ends, width))
+    _, first_runs, run_labels = np.unique(roots, return_index=True, return_inverse=True)
+    run_labels = run_labels.reshape(-1) + 1
+    count = len(first_runs)
+
+    run_marks = np.zeros(width * height, dtype=np.int32)
+    run_marks[columns * height + starts] = 1
+    run_of_pixel = np.cumsum(run_marks) - 1
+    flat_labels = labels.reshape(-1)
+    blank = schema.reshape(-1) == Material.BLANK.value
+    flat_labels[blank] = run_labels[run_of_pixel[blank]]
+
+    areas = np.bincount(run_labels, weights=ends - starts, minlength=count + 1)
+    min_x = np.full(count + 1, width)
+    max_x = np.full(count + 1, -1)
+    min_y = np.full(count + 1, height)
+    max_y = np.full(count + 1, -1)
+    np.minimum.at(min_x, run_labels, columns)
+    np.maximum.at(max_x, run_labels, columns)
+    np.minimum.at(min_y, run_labels, starts)
+    np.maximum.at(max_y, run_labels, ends - 1)
+
+    regions = list()
+    for label in range(1, count + 1):
+        first_run = first_runs[label - 1]
+        regions.append(
+            Region(
+                label,
+                (int(columns[first_run]), int(starts[first_run])),
+                int(areas[label]),
+                (int(min_x[label]), int(min_y[label]), int(max_x[label]), int(max_y[label])),
+            )
+        )
+    return labels, regions
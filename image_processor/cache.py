@@ -0,0 +1,211 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from config.directions import Direction
+from config.globals import color_tolerance, factor
+from house.domain import Door, House, Room, Wall, Window
+from image_processor.service import Processor
+
+FORMAT_VERSION = 2
+DIRECTION_NAMES = {value: name for name, value in vars(Direction).items() if not name.startswith("_")}
+
+
+def _point(point):
+    return tuple(point)
+
+
+def _points(points):
+    return tuple(_point(point) for point in points)
+
+
+def _structures_to_data(structures):
+    return [(structure.points, DIRECTION_NAMES[structure.orientation], structure.inner_margin)
+            for structure in structures]
+
+
+def _data_to_structures(klass, data):
+    return [klass(_points(points), getattr(Direction, orientation), _points(inner_margin))
+            for points, orientation, inner_margin in data]
+
+
+def house_to_data(house):
+    """Keeps only what the processor parsed (rooms, structures and adjacency) as plain data JSON can hold,
+    directions being stored by name.
+    """
+    return {
+        "width": house.width,
+        "height": house.height,
+        "rooms": [
+            {
+                "id": room.id,
+                "origin": room.origin,
+                "farthest_point": room.farthest_point,
+                "walls": _structures_to_data(room.walls),
+                "doors": _structures_to_data(room.doors),
+                "windows": _structures_to_data(room.windows),
+                "area": room.area,
+                "points": room.points,
+                "orientation": DIRECTION_NAMES[room.orientation],
+                "connected_rooms": sorted(other_room.id for other_room in room.connected_rooms),
+            }
+            for room in house.rooms
+        ],
+    }
+
+
+def data_to_house(data):
+    rooms = [
+        Room(
+            room["id"],
+            _point(room["origin"]),
+            _point(room["farthest_point"]),
+            _data_to_structures(Wall, room["walls"]),
+            _data_to_structures(Door, room["doors"]),
+            _data_to_structures(Window, room["windows"]),
+            room["area"],
+            [_point(point) for point in room["points"]],
+            getattr(Direction, room["orientation"]),
+        )
+        for room in data["rooms"]
+    ]
+    rooms_by_id = {room.id: room for room in rooms}
+    for room, room_data in zip(rooms, data["rooms"]):
+        room.connected_rooms = {rooms_by_id[id] for id in room_data["connected_rooms"]}
+    return House(rooms=rooms, width=data["width"], height=data["height"])
+
+
+class HouseCache:
+    """Content addressed cache of the houses parsed by the Processor.
+    Houses are keyed by a hash of the schema content, the factor and the colour
+    tolerance used to read it. The most recently used ones are kept in memory and,
+    when a directory is given, all of them are also written on disk as JSON, the least
+    recently used files being removed once the directory gets bigger than
+    max_disk_size bytes. Every lookup returns a new House, so it can be typed and
+    furnished freely.
+    """
+
+    def __init__(self, directory=None, max_entries=64, max_disk_size=256 * 1024 * 1024,
+                 color_tolerance=color_tolerance):
+        self._directory = directory
+        self._color_tolerance = color_tolerance
+        self._max_entries = max_entries
+        self._max_disk_size = max_disk_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _read(source):
+        """Returns the bytes identifying the schema and a source the Processor can still use."""
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file:
+                source = file.read()
+        elif hasattr(source, "read"):
+            source = source.read()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return [b"encoded", source], source
+        if isinstance(source, Image.Image):
+            # the palette and the transparent colour decide which material the pixels of a "P" image are
+            palette = source.getpalette()
+            transparency = source.info.get("transparency")
+            return [f"image:{source.mode}:{source.size}:{transparency!r}:".encode(),
+                    bytes(palette) if palette is not None else b"", b":", source.tobytes()], source
+        if isinstance(source, np.ndarray):
+            return [f"array:{source.dtype}:{source.shape}".encode(), np.ascontiguousarray(source).data], source
+        raise TypeError(f"Can't read a house schema from {type(source).__name__}")
+
+    def key(self, content):
+        digest = hashlib.sha256(f"{FORMAT_VERSION}:{factor}:{self._color_tolerance}:".encode())
+        for part in content:
+            digest.update(part)
+        return digest.hexdigest()
+
+    def get_house(self, source):
+        content, source = self._read(source)
+        key = self.key(content)
+        data = self._load(key)
+        if data is not None:
+            self.hits += 1
+            return data_to_house(data)
+        self.misses += 1
+        house = Processor(source, self._color_tolerance).get_house()
+        self._store(key, house_to_data(house))
+        return house
+
+    def _path(self, key):
+        return os.path.join(self._directory, f"{key}.house")
+
+    def _load(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return json.loads(self._memory[key])
+        if self._directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                payload = file.read()
+            data = json.loads(payload)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._logger.warning(f"Dropping the unreadable cache entry {path}")
+            self._remove(path)
+            return None
+        self._remember(key, payload)
+        return data
+
+    def _store(self, key, data):
+        payload = json.dumps(data).encode()
+        self._remember(key, payload)
+        if self._directory is None:
+            return
+        path = self._path(key)
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(payload)
+        os.replace(temporary_path, path)
+        self._evict()
+
+    def _remember(self, key, payload):
+        with self._lock:
+            self._memory[key] = payload
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict(self):
+        entries = list()
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith(".house"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self._max_disk_size:
+                break
+            self._remove(path)
+            size -= entry_size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
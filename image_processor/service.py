@@ -1,140 +1,106 @@
+import io
 import logging
-from config.globals import factor
+import os
+from config.globals import color_tolerance, factor
 
+import numpy as np
 from PIL import Image
 
-from config.convertor import pixel_to_material, material_to_class
+from config.convertor import image_to_materials, material_to_class
 from config.directions import Direction
-from config.materials import Material, STRUCTURES
+from config.materials import Material, STRUCTURE_VALUES
 from house.domain import Room, House
 from house.service import set_connected_rooms
-from utils.domain import Matrix
+from image_processor._outline import _BorderRuns
+from image_processor._segmentation import _dilate, _segment
+from utils.domain import Grid
+
+IS_STRUCTURE = np.zeros(256, dtype=bool)
+IS_STRUCTURE[STRUCTURE_VALUES] = True
 
 
 class Processor:
-    def __init__(self, path):
+    """Turns a house schema into a House.
+    The schema can be given as a path, the encoded image as bytes or as a binary
+    file-like object, a decoded PIL image or an array of RGB(A) pixels indexed as [y, x].
+    Decoded images and buffers are used as they are, without being copied first.
+    Colours up to color_tolerance away from a material colour are read as that material.
+    """
+
+    def __init__(self, source, color_tolerance=color_tolerance):
         self._image = None
+        self._color_tolerance = color_tolerance
         self._logger = logging.getLogger(__name__)
-        self._load_image(path)
+        self._load_image(source)
 
-    def _load_image(self, path):
+    def _load_image(self, source):
         if self._image is not None:
-            self._logger.debug(f"Load a new image ({path}) overriding the last one...")
-        self._image = Image.open(path)
-        self._loaded_image = self._image.load()
-        self._logger.debug(f"Loading {path}")
+            self._logger.debug(f"Load a new image ({self._describe(source)}) overriding the last one...")
+        if isinstance(source, (Image.Image, np.ndarray)):
+            self._image = source
+        else:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                source = io.BytesIO(source)
+            self._image = Image.open(source)
+        self._logger.debug(f"Loading {self._describe(source)}")
+
+    @staticmethod
+    def _describe(source):
+        return source if isinstance(source, (str, os.PathLike)) else type(source).__name__
 
     def _image_to_schema(self):
-        schema = Matrix(self._image.height, self._image.width, Material.BLANK)
-        for i in range(self._image.width):
-            for j in range(self._image.height):
-                schema.set(i, j, pixel_to_material(self._loaded_image[i, j]))
-        return schema
+        return Grid.from_array(image_to_materials(self._image, self._color_tolerance), Material)
 
     def get_house(self):
         rooms = list()
         schema = self._image_to_schema()
-        visited = Matrix(self._image.height, self._image.width)
-        room = Matrix(self._image.height, self._image.width, Material.BLANK)
-        self._logger.debug("Marking the outdoor...")
-        self._dfs(schema, room, 0, 0, Material.MARKED, visited)
-        id = 1
-        for i in range(self._image.width):
-            for j in range(self._image.height):
-                if schema.get(i, j) == Material.BLANK:
-                    self._logger.debug("Marking room...")
-                    visited = Matrix(self._image.height, self._image.width)
-                    room = Matrix(self._image.height, self._image.width, Material.BLANK)
-                    area = self._dfs(schema, room, i, j, Material.MARKED, visited)
-                    self._border_room(room, schema)
-                    origin, farthest_point = self._get_origin_and_farthest_point(room)
-                    structures, room_points = self._get_structures(room, origin)
-                    rooms.append(
-                        Room(
-                            id,
-                            origin,
-                            farthest_point,
-                            structures.get(Material.WALL, list()),
-                            structures.get(Material.DOOR, list()),
-                            structures.get(Material.WINDOW, list()),
-                            area,
-                            room_points,
-                            Direction.UP,
-                        )
-                    )
-                    id += 1
+        self._logger.debug("Marking the outdoor and the rooms...")
+        labels, regions = _segment(schema.array)
+        if not regions or regions[0].first != (0, 0):
+            raise BadHouseSchema("The house schema isn't valid")
+        for id, region in enumerate(regions[1:], 1):
+            self._logger.debug(f"Bordering room {id}...")
+            bordered_room = self._border_room(region, labels, schema)
+            origin, farthest_point = self._get_origin_and_farthest_point(bordered_room)
+            # the bordered room starts at the room origin, so there is nothing to subtract
+            structures, room_points = self._get_structures(bordered_room, (0, 0))
+            rooms.append(
+                Room(
+                    id,
+                    origin,
+                    farthest_point,
+                    structures.get(Material.WALL, list()),
+                    structures.get(Material.DOOR, list()),
+                    structures.get(Material.WINDOW, list()),
+                    region.area,
+                    room_points,
+                    Direction.UP,
+                )
+            )
         rooms = set_connected_rooms(rooms)
-        house = House(rooms=rooms, height=self._image.height * factor, width=self._image.width * factor)
+        house = House(rooms=rooms, height=schema.height * factor, width=schema.width * factor)
         return house
 
-    def _dfs(self, schema, room, i, j, block_type, visited):
-        stack = []
-        first = True
-        height = self._image.height
-        width = self._image.width
-        room_area = 0
-        while stack or first:
-            if visited.get(i, j) == 0 and schema.get(i, j) == Material.BLANK:
-                visited.set(i, j, 1)
-                room_area += 1
-                room.set(i, j, Material.MARKED)
-                schema.set(i, j, block_type)
-                if i > 0:
-                    stack.append((schema, room, i - 1, j, block_type, visited))
-                if i < width - 1:
-                    stack.append((schema, room, i + 1, j, block_type, visited))
-                if j > 0:
-                    stack.append((schema, room, i, j - 1, block_type, visited))
-                if j < height - 1:
-                    stack.append((schema, room, i, j + 1, block_type, visited))
-                first = False
-            try:
-                schema, room, i, j, block_type, visited = stack.pop()
-            except:
-                raise BadHouseSchema("The house schema isn't valid")
-        return room_area
-
-    def _border_room(self, room, schema):
-        for i in range(self._image.width):
-            for j in range(self._image.height):
-                if room.get(i, j) == Material.BLANK and Material.MARKED in self._get_neighbors(i, j, room):
-                    room.set(i, j, schema.get(i, j))
-
-    def _get_origin_and_farthest_point(self, bordered_room):
-        origin_x, origin_y = self._image.width, self._image.height
-        far_point_x, far_point_y = 0, 0
-        for x in range(self._image.width):
-            for y in range(self._image.height):
-                if bordered_room.get(x, y) in STRUCTURES:
-                    if origin_x > x:
-                        origin_x = x
-                    if origin_y > y:
-                        origin_y = y
-                    if far_point_x < x:
-                        far_point_x = x
-                    if far_point_y < y:
-                        far_point_y = y
-        return (origin_x * factor, origin_y * factor), (far_point_x * factor, far_point_y * factor)
+    @staticmethod
+    def _border_room(region, labels, schema):
+        min_x, min_y, max_x, max_y = region.bbox
+        window = schema.view(min_x - 1, min_y - 1, max_x + 1, max_y + 1)
+        offset_x, offset_y = window.offset
+        room = labels[offset_x:offset_x + window.width, offset_y:offset_y + window.height] == region.label
+        border = _dilate(room) & ~room & IS_STRUCTURE[window.array]
+        xs, ys = np.nonzero(border)
+        if not len(xs):
+            raise BadHouseSchema("No corner found.")
+        bordered_room = Grid.from_array(
+            np.where(border, window.array, Material.BLANK.value).astype(np.uint8), Material, window.offset
+        )
+        return bordered_room.view(int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max()))
 
     @staticmethod
-    def _get_neighbors(i, j, matrix):
-        neighbors = list()
-        neighbors_index = [
-            (i - 1, j - 1),
-            (i, j - 1),
-            (i - 1, j),
-            (i + 1, j),
-            (i, j + 1),
-            (i + 1, j + 1),
-            (i + 1, j - 1),
-            (i - 1, j + 1),
-        ]
-        for index in neighbors_index:
-            try:
-                neighbors.append(matrix.get(index[0], index[1]))
-            except IndexError:
-                continue
-        return neighbors
+    def _get_origin_and_farthest_point(bordered_room):
+        origin_x, origin_y = bordered_room.offset
+        far_point_x, far_point_y = origin_x + bordered_room.width - 1, origin_y + bordered_room.height - 1
+        return (origin_x * factor, origin_y * factor), (far_point_x * factor, far_point_y * factor)
 
     def _get_structures(self, bordered_room, origin):
 
@@ -150,25 +116,18 @@ class Processor:
             Direction.UP: [Direction.LEFT, Direction.RIGHT],
             Direction.DOWN: [Direction.LEFT, Direction.RIGHT],
         }
-        corner_i, corner_j = None, None
-        for i in range(bordered_room.width):
-            for j in range(bordered_room.height):
-                if bordered_room.get(i, j) in STRUCTURES:
-                    corner_i, corner_j = i, j
-                    break
-            if corner_i is not None:
-                break
-        if corner_i is None:
+        structures = IS_STRUCTURE[bordered_room.array]
+        cells = np.flatnonzero(structures)
+        if not len(cells):
             raise BadHouseSchema("No corner found.")
+        corner_i, corner_j = divmod(int(cells[0]), bordered_room.height)
+        runs = _BorderRuns(bordered_room.array, structures)
 
         room_points = [(corner_i * factor - origin[0], corner_j * factor - origin[1])]
 
         point_i, point_j = corner_i, corner_j
         direction = Direction.RIGHT
-        try:
-            bordered_room.get(corner_i + 1, corner_j)
-        except IndexError:
-            raise BadHouseSchema("Bad house schema, can't return to the start point")
+        turns_left = len(cells)
 
         first_pass = True
         while (point_i != corner_i or point_j != corner_j) or first_pass:
@@ -179,18 +138,22 @@ class Processor:
             current_position = (point_i, point_j)
             to_save = False
             while direction == primary_direction:
-                point_i, point_j, structure = self._move(bordered_room, point_i, point_j, direction)
-                if structure:
+                next_i, next_j = point_i + direction[0], point_j + direction[1]
+                run = runs.find(next_i, next_j, direction)
+                if run:
                     to_save = True
+                    structure = Material(run[0])
+                    steps = self._steps_to_corner(point_i, point_j, corner_i, corner_j, direction, run[1])
                     if current_structure == structure:
-                        current_size += 1
+                        current_size += steps
                     else:
                         klass = self._make_structure(current_position, origin,
                                                      current_structure, current_size, direction)
                         result[current_structure].append(klass)
                         current_structure = structure
-                        current_size = 1
-                        current_position = (point_i, point_j)
+                        current_size = steps
+                        current_position = (next_i, next_j)
+                    point_i, point_j = point_i + direction[0] * steps, point_j + direction[1] * steps
                 else:
                     self._set_room_points(room_points, origin, point_i, point_j)
 
@@ -199,15 +162,16 @@ class Processor:
                                                      current_structure, current_size, direction)
                         result[current_structure].append(klass)
                         to_save = False
-                    point_i, point_j, structure = self._move(bordered_room, point_i, point_j,
-                                                             secondary_direction[direction][0])
-                    if structure:
-                        direction = secondary_direction[direction][0]
+                    turns_left -= 1
+                    first, second = secondary_direction[direction]
+                    if turns_left >= 0 and runs.find(point_i + first[0], point_j + first[1], first):
+                        point_i, point_j = point_i + first[0], point_j + first[1]
+                        direction = first
                         break
-                    point_i, point_j, structure = self._move(bordered_room, point_i, point_j,
-                                                             secondary_direction[direction][1])
-                    if structure:
-                        direction = secondary_direction[direction][1]
+                    if turns_left < 0 or not runs.find(point_i + second[0], point_j + second[1], second):
+                        raise BadHouseSchema("Bad house schema, can't return to the start point")
+                    point_i, point_j = point_i + second[0], point_j + second[1]
+                    direction = second
 
                 if point_j == corner_j and point_i == corner_i and not first_pass:
                     klass = self._make_structure(current_position, origin,
@@ -217,16 +181,18 @@ class Processor:
 
         return result, room_points
 
+    @staticmethod
+    def _steps_to_corner(point_i, point_j, corner_i, corner_j, direction, steps):
+        if direction[0]:
+            distance = (corner_i - point_i) * direction[0] if point_j == corner_j else 0
+        else:
+            distance = (corner_j - point_j) * direction[1] if point_i == corner_i else 0
+        return distance if 0 < distance <= steps else steps
+
     def _set_room_points(self, room_points, origin, point_i, point_j):
         room_points.append(
             (point_i * factor - origin[0], (point_j * factor - origin[1])))
 
-    @staticmethod
-    def _move(bordered_room, i, j, direction):
-        if bordered_room.get(i + direction[0], j + direction[1]) in STRUCTURES:
-            return i + direction[0], j + direction[1], bordered_room.get(i + direction[0], j + direction[1])
-        return i, j, None
-
     @staticmethod
     def _make_structure(current_position, origin, current_structure,
                         current_size, direction):
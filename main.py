@@ -1,23 +1,269 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
 from export.draw import draw_house
+from export.image import load_sprite
 from house.furniture_manager import FurnitureManager
-from house.service import Furnisher, RoomTypesGa
+from house.service import PLACEMENTS, RANDOM_PLACEMENT, Furnisher, RoomTypesSolver, warm_start_rooms_types
+from house.solutions import RoomTypesStore
 from image_processor.service import Processor
+from utils.island_model import IslandModel
+from utils.telemetry import TelemetryRecorder
 
+ROOM_TYPES_OPTIONS = {"no_generations": 4000, "patience": None, "time_limit": None, "islands": 1}
 
-def main():
-    processor = Processor("debug.png")
+_furnisher = None
+_room_types_options = ROOM_TYPES_OPTIONS
+_seed = None
+_telemetry = None
+_solutions = None
+_island_processes = True
+
+
+def furnish(source, furnisher, timings=None, room_types_options=None, report=None, seed=None, observers=None,
+            solutions=None, island_processes=True):
+    """Keyword arguments:
+    room_types_options -- stopping criteria and number of islands of the room types genetic algorithm, see
+    ROOM_TYPES_OPTIONS
+    report -- dictionary receiving how the room types genetic algorithm stopped
+    seed -- seed of every random draw, drawn from the OS by default
+    observers -- GenerationObserver instances following the room types search, unless it runs on islands
+    solutions -- RoomTypesStore the room types search starts from, the report receiving the solution found
+    island_processes -- whether the islands run in their own processes rather than taking turns in this one
+    """
+    timings = timings if timings is not None else dict()
+    room_types_options = dict(ROOM_TYPES_OPTIONS if room_types_options is None else room_types_options)
+    islands = room_types_options.pop("islands", 1)
+    seed_sequence = np.random.SeedSequence(seed)
+    room_types_seed, furniture_seed = seed_sequence.spawn(2)
+    start = time.perf_counter()
+    processor = Processor(source)
     house = processor.get_house()
-    manager = FurnitureManager()
-    furnisher = Furnisher(manager)
+    timings["parse"] = time.perf_counter() - start
 
-    room_type_ga = RoomTypesGa(no_generations=4000, no_chromosomes=10, rooms=house.rooms, mutation_rate=0.3,
-                               mutation_area=0.3)
-    types = room_type_ga.run()
+    start = time.perf_counter()
+    room_type_ga = RoomTypesSolver(no_chromosomes=10, rooms=house.rooms, mutation_rate=0.3, mutation_area=0.3,
+                                   rng=np.random.default_rng(room_types_seed), observers=observers,
+                                   **room_types_options)
+    warm_start_rooms_types(room_type_ga, house.rooms, solutions)
+    if islands > 1 and not room_type_ga.exhaustive:
+        island_model = IslandModel(room_type_ga, islands=islands, processes=island_processes, seed=room_types_seed)
+        types = room_type_ga.to_room_types(island_model.run())
+        search = island_model.best_result
+    else:
+        types = room_type_ga.to_room_types(room_type_ga.run())
+        search = room_type_ga
     for i in range(len(types)):
         house.rooms[i].type = types[house.rooms[i].id]
+    timings["room_types"] = time.perf_counter() - start
+    if report is not None:
+        report["generations"] = search.generations
+        report["stop_reason"] = search.stop_reason.value
+        report["fitness"] = search.best_fitness
+        report["solution"] = {
+            "signature": room_type_ga.signature,
+            "chromosome": room_type_ga.from_room_types(types).tolist(),
+            "fitness": search.best_fitness,
+        }
+
+    start = time.perf_counter()
+    furnisher.seed(furniture_seed)
     furnisher.furnish_house(house)
-    draw_house(house, path='/')
+    timings["furnish"] = time.perf_counter() - start
+    return house
+
+
+def _init_worker(room_types_options=None, seed=None, telemetry=None, solutions_path=None, placement=RANDOM_PLACEMENT,
+                 island_processes=True):
+    global _furnisher, _room_types_options, _seed, _telemetry, _solutions, _island_processes
+    _room_types_options = ROOM_TYPES_OPTIONS if room_types_options is None else room_types_options
+    _seed = seed
+    _telemetry = telemetry
+    _solutions = RoomTypesStore(solutions_path) if solutions_path else None
+    _island_processes = island_processes
+    manager = FurnitureManager()
+    for path in manager.get_images():
+        load_sprite(path)
+    _furnisher = Furnisher(manager, placement=placement)
+
+
+def _process_schema(job):
+    path, output_prefix = job
+    timings = dict()
+    room_types = dict()
+    seed = np.random.SeedSequence(_seed).entropy
+    result = {"file": path, "output": f"{output_prefix}house.png", "seed": seed, "timings": timings,
+              "room_types": room_types}
+    recorder = TelemetryRecorder() if _telemetry else None
+    start = time.perf_counter()
+    try:
+        house = furnish(path, _furnisher, timings, _room_types_options, room_types, seed,
+                        [recorder] if recorder else None, _solutions, _island_processes)
+        if recorder and recorder.summary:
+            result["telemetry"] = f"{output_prefix}telemetry.{_telemetry}"
+            recorder.write(result["telemetry"])
+        draw_start = time.perf_counter()
+        draw_house(house, path=output_prefix)
+        timings["draw"] = time.perf_counter() - draw_start
+        result["status"] = "ok"
+        result["rooms"] = len(house.rooms)
+    except Exception as error:
+        result["status"] = "failed"
+        result["output"] = None
+        result["error"] = f"{type(error).__name__}: {error}"
+    timings["total"] = time.perf_counter() - start
+    return result
+
+
+def _failed_job(job, seed, error):
+    """Result of a job whose worker died before returning one."""
+    return {"file": job[0], "output": None, "seed": seed, "timings": dict(), "room_types": dict(),
+            "status": "failed", "error": f"{type(error).__name__}: {error or 'a worker process died'}"}
+
+
+def find_schemas(inputs):
+    paths = list()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths += sorted(glob.glob(os.path.join(item, "*.png")))
+        elif os.path.isfile(item):
+            paths.append(item)
+        else:
+            paths += sorted(glob.glob(item))
+    return list(dict.fromkeys(paths))
+
+
+def _output_prefixes(paths, output):
+    """Returns the prefix of the files written for every schema: its path relative to the directory holding all
+    of them, without extension, in output, so that schemas of different directories don't overwrite each other.
+    """
+    names = [os.path.splitext(os.path.abspath(path))[0] for path in paths]
+    if not names:
+        return list()
+    root = os.path.commonpath([os.path.dirname(name) for name in names])
+    prefixes = [os.path.join(output, f"{os.path.relpath(name, root)}_") for name in names]
+    repeated = [path for path, prefix in zip(paths, prefixes) if prefixes.count(prefix) > 1]
+    if repeated:
+        raise ValueError(f"The schemas {', '.join(repeated)} would be written to the same files")
+    return prefixes
+
+
+def run_batch(paths, output, workers=None, summary_name="summary.json", room_types_options=None, seed=None,
+              telemetry=None, solutions_path=None, placement=RANDOM_PLACEMENT):
+    """Furnishes every schema, every one of them with the given seed or with its own seed drawn from the OS.
+    With telemetry set to "csv" or "json", the progress of every room types search is written next to its house.
+    With a solutions_path, room types searches start from the solutions of the RoomTypesStore kept in that
+    file, which then receives the solutions of the batch. placement is the way the Furnisher places furniture.
+    """
+    jobs = list(zip(paths, _output_prefixes(paths, output)))
+    os.makedirs(output, exist_ok=True)
+    for _, output_prefix in jobs:
+        os.makedirs(os.path.dirname(output_prefix), exist_ok=True)
+    logger = logging.getLogger(__name__)
+    results = list()
+    start = time.perf_counter()
+    solutions = RoomTypesStore(solutions_path) if solutions_path else None
+
+    def collect(result):
+        solution = result["room_types"].pop("solution", None)
+        if solutions is not None and solution is not None:
+            solutions.add(**solution)
+        results.append(result)
+        if result["status"] == "ok":
+            logger.info(f"{result['file']} -> {result['output']} ({result['timings']['total']:.2f}s)")
+        else:
+            logger.warning(f"{result['file']} failed: {result['error']}")
+
+    if workers == 1 or len(jobs) <= 1:
+        pool = None
+        _init_worker(room_types_options, seed, telemetry, solutions_path, placement)
+        for job in jobs:
+            collect(_process_schema(job))
+    else:
+        # a worker dying (killed when out of memory, crashing) breaks the pool: the jobs it leaves are failures
+        # instead of a batch waiting for them forever. The workers already use the cores, their islands take turns
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(room_types_options, seed, telemetry, solutions_path, placement, False))
+        with pool:
+            futures = {pool.submit(_process_schema, job): job for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    collect(future.result())
+                except BrokenProcessPool as error:
+                    collect(_failed_job(futures[future], seed, error))
+    if solutions is not None:
+        solutions.save()
+    results.sort(key=lambda item: item["file"])
+    summary = {
+        "seconds": time.perf_counter() - start,
+        "workers": 1 if pool is None else workers or os.cpu_count(),
+        "succeeded": sum(1 for result in results if result["status"] == "ok"),
+        "failed": sum(1 for result in results if result["status"] != "ok"),
+        "files": results,
+    }
+    with open(os.path.join(output, summary_name), "w") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Furnish house schemas.")
+    parser.add_argument("inputs", nargs="*", default=["debug.png"],
+                        help="schema files, directories holding .png schemas or glob patterns")
+    parser.add_argument("-o", "--output", default=".", help="directory the furnished houses are written to")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--summary", default="summary.json", help="name of the summary file written in the output")
+    parser.add_argument("--generations", type=int, default=ROOM_TYPES_OPTIONS["no_generations"],
+                        help="maximum number of generations of the room types genetic algorithm")
+    parser.add_argument("--patience", type=int, default=ROOM_TYPES_OPTIONS["patience"],
+                        help="stop the room types genetic algorithm after this many generations without improvement, "
+                             "it runs all its generations by default")
+    parser.add_argument("--time-limit", type=float, default=ROOM_TYPES_OPTIONS["time_limit"],
+                        help="seconds the room types genetic algorithm may run for each schema")
+    parser.add_argument("--islands", type=int, default=ROOM_TYPES_OPTIONS["islands"],
+                        help="number of populations the room types genetic algorithm evolves in parallel, they run "
+                             "in their own processes when a single worker is used")
+    parser.add_argument("--seed", type=int, help="seed every schema is furnished with, to reproduce a run")
+    parser.add_argument("--telemetry", choices=("csv", "json"),
+                        help="write the statistics of every generation of the room types search as "
+                             "<schema name>_telemetry.csv or .json, except for searches running on islands")
+    parser.add_argument("--solutions", help="JSON file keeping the best room types found for every house structure, "
+                                            "searches starting from the ones of houses built the same way")
+    parser.add_argument("--placement", choices=PLACEMENTS, default=RANDOM_PLACEMENT,
+                        help="place furniture at random points along the walls, or at the free places an occupancy "
+                             "grid of the room finds for it")
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    paths = find_schemas(arguments.inputs)
+    if not paths:
+        parser.error("no schema found")
+    try:
+        _output_prefixes(paths, arguments.output)
+    except ValueError as error:
+        parser.error(str(error))
+    room_types_options = {
+        "no_generations": arguments.generations,
+        "patience": arguments.patience,
+        "time_limit": arguments.time_limit,
+        "islands": arguments.islands,
+    }
+    summary = run_batch(paths, arguments.output, arguments.workers, arguments.summary, room_types_options,
+                        arguments.seed, arguments.telemetry, arguments.solutions, arguments.placement)
+    logging.getLogger(__name__).info(
+        f"{summary['succeeded']} furnished, {summary['failed']} failed in {summary['seconds']:.2f}s"
+    )
+    return 1 if summary["failed"] else 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
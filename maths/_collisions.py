@@ -3,52 +3,60 @@ import numpy as np
 from maths.domain import AbstractPolygon
 
 
-def _check_collision(poly1: AbstractPolygon, poly2: AbstractPolygon):
-    p1 = poly1.get_points()
-    p2 = poly2.get_points()
-
-    edges = _edges_of(p1)
-    edges += _edges_of(p2)
-    normals = [_normal(e) for e in edges]
-
-    for o in normals:
-        separates = _is_separating_axis(o, p1, p2)
-        if separates:
-            return False
-
-    return True
-
-
-def _edges_of(vertices):
-    edges = []
-    n = len(vertices)
-    for i in range(n):
-        edge = vertices[(i + 1) % n] - vertices[i]
-        edges.append(edge)
+def _pack(polygons_points):
+    """Packs the vertices of many polygons in a (polygons, vertices, 2) float array. Polygons having less
+    vertices than the others get their last one repeated, which adds empty edges that never separate anything.
+    """
+    polygons_points = [np.asarray(points, dtype=float) for points in polygons_points]
+    size = max((len(points) for points in polygons_points), default=0)
+    packed = np.empty((len(polygons_points), size, 2))
+    for index, points in enumerate(polygons_points):
+        packed[index, :len(points)] = points
+        packed[index, len(points):] = points[-1]
+    return packed
+
+
+def _normals_of(packed):
+    edges = np.roll(packed, -1, axis=1) - packed
+    return np.stack([-edges[..., 1], edges[..., 0]], axis=-1)
+
+
+def _project(packed, normals):
+    """Returns the lowest and highest projection of every polygon on every of its normals."""
+    projections = packed[:, :, np.newaxis, 0] * normals[:, np.newaxis, :, 0] + \
+        packed[:, :, np.newaxis, 1] * normals[:, np.newaxis, :, 1]
+    return projections.min(axis=1), projections.max(axis=1)
+
+
+def _check_collisions(packed1, packed2, normals1=None, normals2=None):
+    """Separating axis test between the convex polygons of two packed arrays, pair by pair; an array holding a
+    single polygon is tested against every polygon of the other. Touching polygons collide.
+    The normals of the polygons are computed when not given.
+    """
+    count = max(len(packed1), len(packed2)) if len(packed1) and len(packed2) else 0
+    if not count or not packed1.shape[1] or not packed2.shape[1]:
+        return np.zeros(count, dtype=bool)
+    normals1 = _normals_of(packed1) if normals1 is None else normals1
+    normals2 = _normals_of(packed2) if normals2 is None else normals2
+    packed1 = np.broadcast_to(packed1, (count,) + packed1.shape[1:])
+    packed2 = np.broadcast_to(packed2, (count,) + packed2.shape[1:])
+    normals = np.concatenate([np.broadcast_to(normals1, packed1.shape), np.broadcast_to(normals2, packed2.shape)],
+                             axis=1)
+    min1, max1 = _project(packed1, normals)
+    min2, max2 = _project(packed2, normals)
+    separates = (max1 < min2) | (max2 < min1)
+    return ~separates.any(axis=1)
 
-    return edges
 
+def _check_collision(poly1: AbstractPolygon, poly2: AbstractPolygon):
+    packed1 = np.asarray(poly1.get_points(), dtype=float)[np.newaxis]
+    packed2 = np.asarray(poly2.get_points(), dtype=float)[np.newaxis]
+    return bool(_check_collisions(packed1, packed2)[0])
 
-def _normal(v):
-    return np.array([-v[1], v[0]])
-
-
-def _is_separating_axis(o, p1, p2):
-    min1, max1 = float('+inf'), float('-inf')
-    min2, max2 = float('+inf'), float('-inf')
-
-    for v in p1:
-        projection = np.dot(v, o)
-
-        min1 = min(min1, projection)
-        max1 = max(max1, projection)
-
-    for v in p2:
-        projection = np.dot(v, o)
 
-        min2 = min(min2, projection)
-        max2 = max(max2, projection)
+def _check_box_collision(box1, box2):
+    """Same as _check_collision for two rectangles with sides parallel to the axes, given as
+    (min_x, min_y, max_x, max_y): touching rectangles collide too.
+    """
+    return box1[2] >= box2[0] and box2[2] >= box1[0] and box1[3] >= box2[1] and box2[3] >= box1[1]
 
-    if max1 >= min2 and max2 >= min1:
-        return False
-    return True
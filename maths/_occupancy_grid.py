@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+
+
+class OccupancyGrid:
+    """Bitmap of the cell_size wide square cells covered by boxes, over the given bounds, the cells starting at
+    multiples of cell_size. Boxes are (min_x, min_y, max_x, max_y) and cover the cells whose inside they overlap,
+    so a box only touching the border of a cell leaves it free. are_free builds a summed-area table over the cells
+    the boxes it is given span, and nowhere else, which then tells in constant time whether each box is free.
+    Keyword arguments:
+    bounds -- (min_x, min_y, max_x, max_y) of the area to cover, anything out of it being occupied
+    cell_size -- width and height of the cells
+    """
+
+    def __init__(self, bounds, cell_size):
+        self.cell_size = cell_size
+        self.origin = (math.floor(bounds[0] / cell_size) * cell_size, math.floor(bounds[1] / cell_size) * cell_size)
+        columns = max(math.ceil((bounds[2] - self.origin[0]) / cell_size), 0)
+        rows = max(math.ceil((bounds[3] - self.origin[1]) / cell_size), 0)
+        self.occupied = np.zeros((columns, rows), dtype=bool)
+        self._origin = np.array(self.origin * 2, dtype=float)
+        self._limits = np.array([columns, rows] * 2)
+
+    def _cell_ranges(self, boxes):
+        """Returns the first and past the last column and row of the cells every box covers, as
+        (start_column, start_row, end_column, end_row) rows.
+        """
+        cells = (np.reshape(np.asarray(boxes, dtype=float), (-1, 4)) - self._origin) / self.cell_size
+        return np.concatenate([np.floor(cells[:, :2]), np.ceil(cells[:, 2:])], axis=1).astype(int)
+
+    def fill(self, boxes):
+        columns, rows = self.occupied.shape
+        for start_column, start_row, end_column, end_row in self._cell_ranges(boxes).tolist():
+            self.occupied[max(start_column, 0):min(end_column, columns), max(start_row, 0):min(end_row, rows)] = True
+
+    def are_free(self, boxes):
+        """Returns a boolean array telling which boxes lie in the bounds of the grid on free cells only."""
+        ranges = self._cell_ranges(boxes)
+        clipped = np.minimum(np.maximum(ranges, 0), self._limits)
+        inside = (ranges == clipped).all(axis=1)
+        if not len(ranges):
+            return inside
+        # the summed-area table of the cells spanned by the boxes, starting at (start_column, start_row)
+        start_column, start_row = clipped[:, :2].min(axis=0).tolist()
+        end_column, end_row = clipped[:, 2:].max(axis=0).tolist()
+        table = np.zeros((max(end_column - start_column, 0) + 1, max(end_row - start_row, 0) + 1), dtype=np.int32)
+        table[1:, 1:] = self.occupied[start_column:end_column, start_row:end_row].cumsum(axis=0).cumsum(axis=1)
+        clipped -= (start_column, start_row, start_column, start_row)
+        corners = table[clipped[:, [2, 0, 2, 0]], clipped[:, [3, 3, 1, 1]]]
+        return inside & (corners @ (1, -1, -1, 1) == 0)
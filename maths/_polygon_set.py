@@ -0,0 +1,49 @@
+import numpy as np
+
+from maths._collisions import _check_collisions, _normals_of, _pack
+from maths.domain import AbstractPolygon
+
+
+class PolygonSet:
+    """Convex polygons packed once, along with their normals, their bounds and, for the rectangles with sides
+    parallel to the axes, their boxes, so that testing other polygons against all of them reuses those.
+    The set can't be changed once built.
+    """
+
+    def __init__(self, polygons):
+        boxes = [polygon.get_axis_aligned_box() for polygon in polygons]
+        self.packed = _pack([polygon.get_points() for polygon in polygons])
+        self.normals = _normals_of(self.packed)
+        self.is_box = np.array([box is not None for box in boxes], dtype=bool)
+        self.boxes = np.array([box if box is not None else (np.nan,) * 4 for box in boxes], dtype=float)
+        self.boxes = self.boxes.reshape(len(boxes), 4)
+        self.bounds = np.concatenate([self.packed.min(axis=1), self.packed.max(axis=1)], axis=1) if len(boxes) else \
+            np.empty((0, 4))
+        # Two boxes collide when each one ends after the other starts on both axes, so that with the ends of
+        # the boxes of the set stored as (max_x, max_y, -min_x, -min_y) all four comparisons are a single one.
+        self._ends = np.concatenate([self.boxes[:, 2:], -self.boxes[:, :2]], axis=1)
+        self._all_boxes = bool(self.is_box.all())
+        for array in (self.packed, self.normals, self.is_box, self.boxes, self.bounds, self._ends):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.packed)
+
+    def _box_collisions(self, box):
+        return (self._ends >= np.array((box[0], box[1], -box[2], -box[3]))).all(axis=1)
+
+    def collisions(self, polygon: AbstractPolygon):
+        """Returns a boolean array telling which polygons of the set the polygon collides with."""
+        box = polygon.get_axis_aligned_box()
+        if box is not None and self._all_boxes:
+            return self._box_collisions(box)
+        packed = np.asarray(polygon.get_points(), dtype=float)[np.newaxis]
+        if box is None:
+            return _check_collisions(packed, self.packed, normals2=self.normals)
+        hits = self._box_collisions(box)
+        others = ~self.is_box
+        hits[others] = _check_collisions(packed, self.packed[others], normals2=self.normals[others])
+        return hits
+
+    def collides(self, polygon: AbstractPolygon):
+        return bool(len(self)) and bool(self.collisions(polygon).any())
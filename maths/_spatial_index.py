@@ -0,0 +1,52 @@
+import math
+from collections import defaultdict
+
+from maths.domain import AbstractPolygon
+
+
+class SpatialIndex:
+    """Uniform grid bucketing items by the cells their polygon's bounding box covers.
+    A query returns every item whose bounding box may touch the one of the queried polygon
+    (items sharing only a border included, since touching polygons collide), in insertion order.
+    Keyword arguments:
+    cell_size -- width and height of the cells
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _cell_range(self, polygon: AbstractPolygon):
+        box = polygon.get_axis_aligned_box()
+        if box is not None:
+            min_x, min_y, max_x, max_y = box
+        else:
+            points = polygon.get_points()
+            min_x, min_y = points.min(axis=0).tolist()
+            max_x, max_y = points.max(axis=0).tolist()
+        return (
+            range(math.floor(min_x / self.cell_size), math.floor(max_x / self.cell_size) + 1),
+            range(math.floor(min_y / self.cell_size), math.floor(max_y / self.cell_size) + 1),
+        )
+
+    def insert(self, item, polygon: AbstractPolygon):
+        columns, rows = self._cell_range(polygon)
+        entry = (self._count, item)
+        for column in columns:
+            for row in rows:
+                self._cells[column, row].append(entry)
+        self._count += 1
+
+    def query(self, polygon: AbstractPolygon):
+        columns, rows = self._cell_range(polygon)
+        found = dict()
+        for column in columns:
+            for row in rows:
+                cell = self._cells.get((column, row))
+                if cell:
+                    found.update(cell)
+        return [found[order] for order in sorted(found)]
@@ -3,18 +3,47 @@ import numpy as np
 from maths._transform import Transform
 
 
+def _get_axis_aligned_box(points):
+    """Returns (min_x, min_y, max_x, max_y) when the points are the corners of a rectangle with sides parallel
+    to the axes and not reduced to a segment, None otherwise.
+    """
+    if len(points) != 4:
+        return None
+    xs, ys = np.asarray(points)[:, 0].tolist(), np.asarray(points)[:, 1].tolist()
+    horizontal = ys[0] == ys[1]
+    for index in range(4):
+        dx = xs[(index + 1) % 4] - xs[index]
+        dy = ys[(index + 1) % 4] - ys[index]
+        if (dx == 0) == horizontal or (dy == 0) != horizontal:
+            return None
+        horizontal = not horizontal
+    return min(xs), min(ys), max(xs), max(ys)
+
+
 class AbstractPolygon:
     def get_points(self):
         pass
 
+    def get_axis_aligned_box(self):
+        return _get_axis_aligned_box(self.get_points())
+
 
 class Polygon(AbstractPolygon):
     def __init__(self, vertices):
         self._vertices = np.array(vertices)
+        self._axis_aligned_box = None
+        self._box_computed = False
 
     def get_points(self):
         return self._vertices
 
+    def get_axis_aligned_box(self):
+        """Same as for any polygon, computed only once since the vertices of a Polygon do not change."""
+        if not self._box_computed:
+            self._axis_aligned_box = _get_axis_aligned_box(self._vertices)
+            self._box_computed = True
+        return self._axis_aligned_box
+
 
 class Rect(AbstractPolygon):
     def __init__(self, width, height, transform=None):
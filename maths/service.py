@@ -1,10 +1,15 @@
 import math
 from typing import List
 
+import numpy as np
+
 from maths._ccw import _are_points_ccw
-from maths._collisions import _check_collision
+from maths._collisions import _check_collision, _check_collisions, _check_box_collision, _pack
 from maths.domain import AbstractPolygon, Polygon
+from maths._occupancy_grid import OccupancyGrid
 from maths._poly_decomp import _convex_decomp
+from maths._polygon_set import PolygonSet
+from maths._spatial_index import SpatialIndex
 
 
 def convex_decomposition(polygon: AbstractPolygon):
@@ -14,25 +19,69 @@ def convex_decomposition(polygon: AbstractPolygon):
 
 
 def check_collision(polygon_a: AbstractPolygon, polygon_b: AbstractPolygon):
+    box_a = polygon_a.get_axis_aligned_box()
+    if box_a is not None:
+        box_b = polygon_b.get_axis_aligned_box()
+        if box_b is not None:
+            return _check_box_collision(box_a, box_b)
     return _check_collision(polygon_a, polygon_b)
 
 
-def check_collision_concave(polygon_concave: List[AbstractPolygon], polygon_convex: AbstractPolygon):
-    for poly in polygon_concave:
-        if check_collision(poly, polygon_convex):
-            return True
-    return False
+def pack_polygons(polygons: List[AbstractPolygon]):
+    """Packs the vertices of the polygons in a (polygons, vertices, 2) array check_collisions takes."""
+    return _pack([polygon.get_points() for polygon in polygons])
+
+
+def _as_packed(polygons):
+    if isinstance(polygons, AbstractPolygon):
+        return np.asarray(polygons.get_points(), dtype=float)[np.newaxis]
+    if isinstance(polygons, np.ndarray):
+        return polygons
+    return pack_polygons(polygons)
+
+
+def check_collisions(polygons_a, polygons_b):
+    """Returns a boolean array telling which pairs of convex polygons collide, touching ones included.
+    Keyword arguments:
+    polygons_a -- a polygon, a list of polygons or the array pack_polygons makes of them
+    polygons_b -- same as polygons_a, holding as many polygons, or one to test against all of polygons_a
+    """
+    return _check_collisions(_as_packed(polygons_a), _as_packed(polygons_b))
+
+
+def check_collision_concave(polygon_concave, polygon_convex: AbstractPolygon):
+    """polygon_concave is the list of convex parts convex_decomposition returns, or its pack_polygons array."""
+    if not len(polygon_concave):
+        return False
+    return bool(check_collisions(polygon_convex, polygon_concave).any())
+
+
+def get_bounds(polygon: AbstractPolygon):
+    """Returns (min_x, min_y, max_x, max_y) of the polygon."""
+    points = polygon.get_points()
+    return (*points.min(axis=0).tolist(), *points.max(axis=0).tolist())
 
 
 def are_points_ccw(points):
     return _are_points_ccw(points)
 
 
+def _cos_sin(angle):
+    """Exact for quarter turns, which math.cos and math.sin are not (math.cos(math.pi / 2) is 6e-17), so that
+    rectangles rotated by them keep sides parallel to the axes.
+    """
+    quarter_turns = angle / (math.pi / 2)
+    if quarter_turns == round(quarter_turns):
+        return ((1, 0), (0, 1), (-1, 0), (0, -1))[round(quarter_turns) % 4]
+    return math.cos(angle), math.sin(angle)
+
+
 def rotate(origin, point, angle):
     ox, oy = origin
     px, py = point
+    cos, sin = _cos_sin(angle)
 
-    qx = ox + math.cos(angle) * (px - ox) - math.sin(angle) * (py - oy)
-    qy = oy + math.sin(angle) * (px - ox) + math.cos(angle) * (py - oy)
+    qx = ox + cos * (px - ox) - sin * (py - oy)
+    qy = oy + sin * (px - ox) + cos * (py - oy)
     return qx, qy
 
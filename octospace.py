@@ -1,20 +1,42 @@
 from flask import Flask, render_template, send_from_directory
 from flask import Flask, flash, request, redirect, url_for
 from werkzeug.utils import secure_filename
+import atexit
 import os
 import string
 import random
+import numpy as np
 from export.draw import draw_house
 from house.furniture_manager import FurnitureManager
-from house.service import Furnisher, RoomTypesGa
-from image_processor.service import Processor
+from house.service import Furnisher, RoomTypesSolver, warm_start_rooms_types
+from house.solutions import RoomTypesStore
+from image_processor.cache import HouseCache
+from utils.island_model import IslandModel
 
 UPLOAD_FOLDER = 'external/uploads'
 RESULTS_FOLDER = 'external/results'
+CACHE_FOLDER = 'external/cache'
+SOLUTIONS_FILE = 'external/solutions.json'
+# the solutions found are written to SOLUTIONS_FILE at most every SOLUTIONS_SAVE_INTERVAL seconds and at shutdown
+SOLUTIONS_SAVE_INTERVAL = 60
 ALLOWED_EXTENSIONS = {'png', }
+# the room types search stops after ROOM_TYPES_TIME_LIMIT seconds and, when the ROOM_TYPES_PATIENCE setting (or
+# environment variable) is set, after that many generations without improvement; early stopping finds worse room
+# types, so it is off by default
+ROOM_TYPES_PATIENCE = None
+ROOM_TYPES_TIME_LIMIT = 5
+# houses with at least LARGE_HOUSE_ROOMS rooms get their room types searched by several islands, taking turns in
+# the thread of the request rather than forking processes on every request
+LARGE_HOUSE_ROOMS = 12
+ROOM_TYPES_ISLANDS = 4
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['ROOM_TYPES_PATIENCE'] = int(os.environ['ROOM_TYPES_PATIENCE']) if os.environ.get('ROOM_TYPES_PATIENCE') \
+    else ROOM_TYPES_PATIENCE
+house_cache = HouseCache(directory=CACHE_FOLDER)
+solutions = RoomTypesStore(SOLUTIONS_FILE)
+atexit.register(solutions.save_changes)
 
 
 def generate_filename(prefix):
@@ -31,6 +53,43 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def furnish_schema(source, filename, seed=None):
+    """Furnishes the schema, the seed of its random draws being logged and sent in the X-Seed header."""
+    seed_sequence = np.random.SeedSequence(seed)
+    room_types_seed, furniture_seed = seed_sequence.spawn(2)
+    house = house_cache.get_house(source)
+    manager = FurnitureManager(rng=np.random.default_rng(furniture_seed))
+    furnisher = Furnisher(manager)
+
+    room_type_ga = RoomTypesSolver(no_generations=4000, no_chromosomes=10, rooms=house.rooms, mutation_rate=0.3,
+                                   mutation_area=0.3, patience=app.config['ROOM_TYPES_PATIENCE'],
+                                   time_limit=ROOM_TYPES_TIME_LIMIT, rng=np.random.default_rng(room_types_seed))
+    warm_start_rooms_types(room_type_ga, house.rooms, solutions)
+    if len(house.rooms) >= LARGE_HOUSE_ROOMS and ROOM_TYPES_ISLANDS > 1 and not room_type_ga.exhaustive:
+        island_model = IslandModel(room_type_ga, islands=ROOM_TYPES_ISLANDS, processes=False,
+                                   seed=room_types_seed)
+        types = room_type_ga.to_room_types(island_model.run())
+        search = island_model.best_result
+    else:
+        types = room_type_ga.to_room_types(room_type_ga.run())
+        search = room_type_ga
+    app.logger.info(f"Room types of {filename} found in {search.generations} generations ({search.stop_reason.value}), "
+                    f"seed {seed_sequence.entropy}")
+    solutions.add(room_type_ga.signature, room_type_ga.from_room_types(types), search.best_fitness)
+    solutions.save_changes(SOLUTIONS_SAVE_INTERVAL)
+    for i in range(len(types)):
+        house.rooms[i].type = types[house.rooms[i].id]
+    furnisher.furnish_house(house)
+    name = generate_filename(prefix=filename.split(".")[0])
+    try:
+        draw_house(house, path=f'{RESULTS_FOLDER}/{name}')
+    except Exception:
+        return redirect(url_for('primary_page'))
+    response = send_from_directory(f'{RESULTS_FOLDER}', f"{name}house.png")
+    response.headers["X-Seed"] = str(seed_sequence.entropy)
+    return response
+
+
 @app.route('/', methods=['POST', 'GET'])
 def primary_page():
     if request.method == 'POST':
@@ -41,30 +100,15 @@ def primary_page():
             return redirect(request.url)
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-            return redirect(url_for('result_page', filename=filename))
+            return furnish_schema(file.stream, filename)
     return render_template("base.html")
 
 
 @app.route('/result/<filename>')
 def result_page(filename):
-    processor = Processor(filename)
-    house = processor.get_house()
-    manager = FurnitureManager()
-    furnisher = Furnisher(manager)
-
-    room_type_ga = RoomTypesGa(no_generations=4000, no_chromosomes=10, rooms=house.rooms, mutation_rate=0.3,
-                               mutation_area=0.3)
-    types = room_type_ga.run()
-    for i in range(len(types)):
-        house.rooms[i].type = types[house.rooms[i].id]
-    furnisher.furnish_house(house)
-    name = generate_filename(prefix=filename.split(".")[0])
-    try:
-        draw_house(house, path=f'{RESULTS_FOLDER}/{name}')
-    except Exception:
-        return redirect(url_for('primary_page'))
-    return send_from_directory(f'{RESULTS_FOLDER}', f"{name}house.png")
+    filename = secure_filename(filename)
+    return furnish_schema(os.path.join(app.config['UPLOAD_FOLDER'], filename), filename,
+                          request.args.get("seed", type=int))
 
 
 if __name__ == "__main__":
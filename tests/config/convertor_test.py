@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from config.convertor import image_to_materials, pixel_to_material
+from config.materials import Material, MaterialClassifier
+
+
+class ImageToMaterialsTest(unittest.TestCase):
+    PIXELS = [
+        [(255, 255, 255), (0, 0, 0), (255, 0, 0)],
+        [(0, 0, 255), (12, 34, 56), (0, 0, 0)],
+    ]
+
+    def make_image(self, mode):
+        image = Image.new(mode, (len(self.PIXELS[0]), len(self.PIXELS)))
+        for y, row in enumerate(self.PIXELS):
+            for x, color in enumerate(row):
+                image.putpixel((x, y), color + (255,) if mode == "RGBA" else color)
+        return image
+
+    def expected(self, image):
+        return np.array([
+            [pixel_to_material(image.getpixel((x, y))).value for y in range(image.height)]
+            for x in range(image.width)
+        ])
+
+    def test_rgb(self):
+        image = self.make_image("RGB")
+        materials = image_to_materials(image)
+        self.assertEqual(materials.dtype, np.uint8)
+        self.assertEqual(materials.shape, (image.width, image.height))
+        self.assertTrue(np.array_equal(materials, self.expected(image)))
+
+    def test_rgba_matches_rgb(self):
+        self.assertTrue(np.array_equal(image_to_materials(self.make_image("RGBA")),
+                                       image_to_materials(self.make_image("RGB"))))
+
+    def test_translucent_pixels_are_blank(self):
+        image = self.make_image("RGBA")
+        image.putpixel((1, 0), (0, 0, 0, 128))
+        self.assertEqual(image_to_materials(image)[1, 0], Material.BLANK.value)
+
+
+class MaterialClassifierTest(unittest.TestCase):
+    def test_palette_image(self):
+        image = ImageToMaterialsTest().make_image("RGB")
+        palette_image = image.convert("P", palette=Image.ADAPTIVE, colors=8)
+        self.assertEqual(palette_image.mode, "P")
+        self.assertTrue(np.array_equal(image_to_materials(palette_image), image_to_materials(image)))
+
+    def test_palette_transparency(self):
+        image = Image.new("P", (2, 1))
+        image.putpalette([0, 0, 0, 255, 0, 0] + [255] * 762)
+        image.putpixel((0, 0), 0)
+        image.putpixel((1, 0), 1)
+        image.info["transparency"] = 1
+        self.assertEqual(image_to_materials(image).tolist(), [[Material.WALL.value], [Material.BLANK.value]])
+
+    def test_tolerance(self):
+        pixels = np.array([[[250, 3, 2, 255], [10, 10, 240, 250], [100, 100, 100, 255], [4, 0, 0, 200]]],
+                          dtype=np.uint8)
+        exact = MaterialClassifier().classify(pixels)
+        near = MaterialClassifier(tolerance=16).classify(pixels)
+        self.assertEqual(exact.ravel().tolist(), [Material.BLANK.value] * 4)
+        self.assertEqual(near.ravel().tolist(), [
+            Material.DOOR.value, Material.WINDOW.value, Material.BLANK.value, Material.BLANK.value
+        ])
+
+    def test_tolerance_bounds(self):
+        with self.assertRaises(ValueError):
+            MaterialClassifier(tolerance=128)
+
+
+if __name__ == '__main__':
+    unittest.main()
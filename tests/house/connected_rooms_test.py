@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from config.directions import Direction
+from house.domain import Door, Room, RoomGraph
+from house.service import set_connected_rooms
+
+
+def make_room(id, origin, doors):
+    doors = [
+        Door(((x, y), (x + 100, y), (x + 100, y + 50), (x, y + 50)), Direction.LEFT, ((x, y), (x + 100, y)))
+        for x, y in doors
+    ]
+    return Room(id, origin, (origin[0] + 300, origin[1] + 300), [], doors, [], 9,
+                [(0, 0), (0, 300), (300, 300), (300, 0)], Direction.UP)
+
+
+class ConnectedRoomsTest(unittest.TestCase):
+    def make_rooms(self):
+        return [
+            make_room(1, (0, 0), [(100, 250)]),
+            make_room(2, (0, 250), [(100, 0), (250, 100)]),
+            make_room(3, (250, 250), [(0, 100.0)]),
+            make_room(4, (600, 0), [(100, 250)]),
+        ]
+
+    def test_rooms_sharing_a_door_are_connected(self):
+        first, second, third, fourth = set_connected_rooms(self.make_rooms())
+        self.assertEqual(first.connected_rooms, {second})
+        self.assertEqual(second.connected_rooms, {first, third})
+        self.assertEqual(third.connected_rooms, {second})
+        self.assertEqual(fourth.connected_rooms, set())
+
+    def test_graph(self):
+        graph = RoomGraph(set_connected_rooms(self.make_rooms()))
+        self.assertEqual(graph.positions, {1: 0, 2: 1, 3: 2, 4: 3})
+        self.assertEqual(graph.neighbors, [[1], [0, 2], [1], []])
+        self.assertEqual(graph.edges(), [(0, 1), (1, 2)])
+        matrix = graph.adjacency_matrix()
+        self.assertTrue(np.array_equal(matrix, matrix.T))
+        self.assertEqual(matrix.sum(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import itertools
+import pickle
+import random
+import unittest
+
+import numpy as np
+
+from config.directions import Direction
+from config.room_types import RoomType
+from house.domain import Door, Room, Window
+from house.fitness import RoomFeatures, RoomTypesFitness
+from house.service import RoomTypesGa, RoomTypesSolver
+from utils.genetic_algorithm import StopReason
+
+
+def reference_fitness(rooms, chromosome):
+    """The room type rules written room by room, as they were before being vectorized."""
+    fitness = 0
+    area_average = sum(room.area for room in rooms) / len(rooms) if len(rooms) else 0
+    counts = {room_type: 0 for room_type in
+              [RoomType.KITCHEN, RoomType.BEDROOM, RoomType.BATHROOM, RoomType.HALL, RoomType.LIVINGROOM]}
+    for room in rooms:
+        for neighbor in room.connected_rooms:
+            if chromosome[room.id] == RoomType.BATHROOM:
+                fitness -= 800 * len(room.windows)
+                fitness += 300 if area_average > room.area else -200
+                fitness += 300 if chromosome[neighbor.id] in (RoomType.BEDROOM, RoomType.HALL) else -300
+            elif chromosome[room.id] == RoomType.KITCHEN:
+                if chromosome[neighbor.id] == RoomType.LIVINGROOM:
+                    fitness += 400
+                elif chromosome[neighbor.id] == RoomType.HALL:
+                    fitness += 100
+                else:
+                    fitness -= 300
+            elif chromosome[room.id] == RoomType.BEDROOM and area_average < room.area:
+                fitness += 300
+        if chromosome[room.id] == RoomType.HALL:
+            if len(room.doors) == 1:
+                fitness -= 1000
+            if len(room.doors) > len(room.connected_rooms):
+                fitness += 600
+            fitness += 600 * len(room.doors)
+        counts[chromosome[room.id]] += 1
+    max_count, max_room_type = 0, None
+    for room_type, count in counts.items():
+        if count > 0:
+            fitness += 300
+        if count > max_count:
+            max_count, max_room_type = count, room_type
+    fitness -= 600 if counts[RoomType.BATHROOM] == 0 else 0
+    fitness -= 800 if counts[RoomType.BEDROOM] == 0 else 0
+    fitness -= 400 if counts[RoomType.KITCHEN] == 0 else 0
+    fitness += 600 if max_room_type == RoomType.BEDROOM else 0
+    if counts[RoomType.HALL] > 0 and (counts[RoomType.BEDROOM] == 0 or counts[RoomType.KITCHEN] == 0):
+        fitness -= 1000
+    return fitness
+
+
+def make_rooms(count, seed):
+    rand = random.Random(seed)
+    rooms = list()
+    for id in range(count):
+        door = Door(((0, 0), (1, 0), (1, 1), (0, 1)), Direction.UP, ((0, 0), (1, 0)))
+        window = Window(((0, 0), (1, 0), (1, 1), (0, 1)), Direction.UP, ((0, 0), (1, 0)))
+        rooms.append(Room(id, (0, 0), (1, 1), [], [door] * rand.randint(0, 3), [window] * rand.randint(0, 2),
+                          rand.choice([4, 9, 9, 16]), [], Direction.UP))
+    for room in rooms:
+        for other_room in rand.sample(rooms, rand.randint(0, min(3, count))):
+            if other_room is not room:
+                room.connected_rooms.add(other_room)
+                other_room.connected_rooms.add(room)
+    return rooms
+
+
+class RoomTypesFitnessTest(unittest.TestCase):
+    def test_matches_the_room_by_room_rules(self):
+        rand = random.Random(7)
+        for count in [1, 2, 5, 12]:
+            rooms = make_rooms(count, count)
+            fitness = RoomTypesFitness(RoomFeatures(rooms))
+            chromosomes = [{room.id: rand.choice(list(RoomType)) for room in rooms} for _ in range(200)]
+            population = [[chromosome[room.id].value for room in rooms] for chromosome in chromosomes]
+            self.assertEqual(
+                fitness.evaluate(population).tolist(),
+                [reference_fitness(rooms, chromosome) for chromosome in chromosomes],
+            )
+
+    def test_delta_matches_the_room_by_room_rules(self):
+        rand = random.Random(11)
+        rooms = make_rooms(12, 5)
+        fitness = RoomTypesFitness(RoomFeatures(rooms))
+        for changes in [0, 1, 2, 5, 12] * 20:
+            parent = np.array([rand.randrange(len(RoomType)) for _ in rooms], dtype=np.int8)
+            child = parent.copy()
+            for position in rand.sample(range(len(rooms)), changes):
+                child[position] = rand.randrange(len(RoomType))
+            expected = reference_fitness(rooms, {room.id: RoomType(int(value)) for room, value in zip(rooms, child)})
+            self.assertEqual(fitness.evaluate_delta(parent, int(fitness.evaluate(parent)[0]), child), expected)
+
+    def test_genetic_algorithm_uses_the_batch_scores(self):
+        rooms = make_rooms(6, 3)
+        ga = RoomTypesGa(1, 10, rooms)
+        chromosomes = ga.get_random_chromosomes(20)
+        expected = [reference_fitness(rooms, ga.to_room_types(chromosome)) for chromosome in chromosomes]
+        self.assertEqual(ga.get_fitnesses(chromosomes), expected)
+        self.assertEqual(ga.get_fitness(chromosomes[0]), expected[0])
+        ga.sort_by_fitness(chromosomes)
+        self.assertEqual([ga.get_fitness(chromosome) for chromosome in chromosomes], sorted(expected))
+
+
+class RoomTypesGaTest(unittest.TestCase):
+    def test_chromosomes_are_room_type_arrays(self):
+        rooms = make_rooms(5, 1)
+        ga = RoomTypesGa(1, 10, rooms, mutation_area=1)
+        chromosome = ga.get_random_chromosome()
+        self.assertEqual(chromosome.shape, (5,))
+        room_types = ga.to_room_types(chromosome)
+        self.assertEqual(list(room_types), [room.id for room in rooms])
+        self.assertTrue(all(isinstance(room_type, RoomType) for room_type in room_types.values()))
+        self.assertEqual(ga.from_room_types(room_types).tolist(), chromosome.tolist())
+
+        mother = ga.from_room_types({room.id: RoomType.HALL for room in rooms})
+        father = ga.from_room_types({room.id: RoomType.KITCHEN for room in rooms})
+        child = ga.crossover(mother, father)
+        self.assertTrue(set(child.tolist()) <= {RoomType.HALL.value, RoomType.KITCHEN.value})
+        self.assertEqual(ga.mutate(child).dtype, child.dtype)
+
+    def test_run_returns_the_best_chromosome_found(self):
+        rooms = make_rooms(4, 2)
+        ga = RoomTypesGa(50, 10, rooms)
+        best = ga.run()
+        self.assertEqual(ga.get_fitness(best), reference_fitness(rooms, ga.to_room_types(best)))
+
+    def test_seeded_runs_are_reproducible(self):
+        rooms = make_rooms(10, 4)
+        results = list()
+        for _ in range(2):
+            ga = RoomTypesGa(100, 10, rooms, rng=np.random.default_rng(42))
+            results.append((ga.run().tolist(), ga.best_fitness))
+        copied = pickle.loads(pickle.dumps(ga))
+        copied.seed(42)
+        self.assertEqual(copied.run().tolist(), results[0][0])
+        self.assertEqual(results[0], results[1])
+
+
+class RoomTypesSolverTest(unittest.TestCase):
+    def test_small_houses_get_the_best_assignment(self):
+        rooms = make_rooms(5, 6)
+        solver = RoomTypesSolver(10, 10, rooms, batch_size=1000)
+        self.assertTrue(solver.exhaustive)
+        best = solver.run()
+        assignments = itertools.product(list(RoomType), repeat=len(rooms))
+        expected = max(reference_fitness(rooms, dict(zip(range(5), assignment))) for assignment in assignments)
+        self.assertEqual(solver.best_fitness, expected)
+        self.assertEqual(reference_fitness(rooms, solver.to_room_types(best)), expected)
+        self.assertEqual(solver.stop_reason, StopReason.EXHAUSTED)
+
+    def test_houses_without_rooms(self):
+        solver = RoomTypesSolver(10, 10, [])
+        self.assertEqual(solver.to_room_types(solver.run()), dict())
+
+    def test_large_houses_are_left_to_the_genetic_algorithm(self):
+        solver = RoomTypesSolver(20, 10, make_rooms(5, 6), max_assignments=100)
+        self.assertFalse(solver.exhaustive)
+        solver.run()
+        self.assertEqual(solver.generations, 20)
+        self.assertEqual(solver.stop_reason, StopReason.GENERATIONS)
@@ -0,0 +1,89 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from config.room_types import RoomType
+from house.domain import Furniture
+from house.furniture_manager import FurnitureManager
+from house.service import GRID_PLACEMENT, Furnisher, can_place_furniture
+from image_processor.service import Processor
+from maths.service import OccupancyGrid, check_collision
+
+
+class FurnisherSeedTest(unittest.TestCase):
+    def furnish(self, furnisher):
+        house = Processor("debug.png").get_house()
+        for room in house.rooms:
+            room.type = RoomType.BEDROOM
+        furnisher.furnish_house(house)
+        return [[(furniture.type, furniture.points) for furniture in room.furniture] for room in house.rooms]
+
+    def test_seeded_furnishing_is_reproducible(self):
+        furnisher = Furnisher(FurnitureManager(), rng=np.random.default_rng(3))
+        first = self.furnish(furnisher)
+        furnisher.seed(3)
+        self.assertEqual(self.furnish(furnisher), first)
+        self.assertEqual(self.furnish(Furnisher(FurnitureManager(rng=np.random.default_rng(3)))), first)
+        self.assertTrue(any(first))
+
+
+class CanPlaceFurnitureTest(unittest.TestCase):
+    def test_walls_and_placed_furniture_block(self):
+        room = Processor("debug.png").get_house().rooms[0]
+        room.type = RoomType.BEDROOM
+        wall = room.walls[0]
+        self.assertFalse(can_place_furniture(Furniture(wall.poly.get_points().tolist(), wall.orientation, None, "test"),
+                                             room))
+
+        Furnisher(FurnitureManager(), rng=np.random.default_rng(3)).furnish_room(room)
+        self.assertTrue(room.furniture)
+        for placed in room.furniture:
+            copy = Furniture(placed.poly.get_points().tolist(), placed.orientation, None, placed.type)
+            self.assertFalse(can_place_furniture(copy, room))
+
+    def test_obstacles_are_compiled_once(self):
+        room = Processor("debug.png").get_house().rooms[0]
+        room.type = RoomType.BEDROOM
+        obstacles = room.obstacles
+        self.assertEqual(len(obstacles.blocking), len(room.walls) + len(room.windows) + 2 * len(room.doors))
+        self.assertEqual(len(obstacles.tall_only), len(room.windows))
+        furnisher = Furnisher(FurnitureManager(), rng=np.random.default_rng(3))
+        furnisher.furnish_room(room)
+        furnisher.furnish_room(room)
+        self.assertIs(room.obstacles, obstacles)
+
+    def test_grid_placement(self):
+        room = Processor("debug.png").get_house().rooms[0]
+        room.type = RoomType.BEDROOM
+        Furnisher(FurnitureManager(), rng=np.random.default_rng(3), placement=GRID_PLACEMENT).furnish_room(room)
+        self.assertTrue(room.furniture)
+        for index, placed in enumerate(room.furniture):
+            others = room.furniture[:index] + room.furniture[index + 1:]
+            self.assertFalse(any(check_collision(placed.poly, other.poly) for other in others))
+            self.assertFalse(room.obstacles.collide(placed))
+
+    def test_grid_placement_in_a_large_room(self):
+        rooms = Processor("debug_blockers.png").get_house().rooms
+        room = max(rooms, key=lambda room: room.area)
+        room.type = RoomType.LIVINGROOM
+        furnisher = Furnisher(FurnitureManager(), rng=np.random.default_rng(0), placement=GRID_PLACEMENT)
+        are_free = OccupancyGrid.are_free
+        spans = list()
+
+        def record_span(grid, boxes):
+            min_x, min_y = np.min(boxes, axis=0)[:2]
+            max_x, max_y = np.max(boxes, axis=0)[2:]
+            spans.append((max_x - min_x) * (max_y - min_y) / grid.cell_size ** 2 / grid.occupied.size)
+            return are_free(grid, boxes)
+
+        with mock.patch.object(OccupancyGrid, "are_free", record_span):
+            furnisher.furnish_room(room)
+        # the grid of the room has 8 million cells, the summed-area tables only cover the band along a wall
+        self.assertTrue(spans)
+        self.assertLess(max(spans), 0.01)
+        self.assertTrue(room.furniture)
+
+    def test_unknown_placement(self):
+        with self.assertRaises(ValueError):
+            Furnisher(FurnitureManager(), placement="everywhere")
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from config.room_types import RoomType
+from house.fitness import RoomFeatures
+from house.service import RoomTypesGa, sample_rooms_types, set_rooms_types, warm_start_rooms_types
+from house.solutions import RoomTypesStore, get_signature
+from image_processor.service import Processor
+
+
+class RoomTypesStoreTest(unittest.TestCase):
+    def test_keeps_the_best_solutions_of_every_signature(self):
+        store = RoomTypesStore(max_solutions=2)
+        store.add("a", np.array([1, 2], dtype=np.int8), 10)
+        store.add("a", [3, 4], 30)
+        store.add("a", [1, 2], 20)
+        store.add("a", [0, 0], 5)
+        store.add("b", [4], 1)
+        self.assertEqual([chromosome.tolist() for chromosome in store.get("a")], [[3, 4], [1, 2]])
+        self.assertEqual(store.get("a")[0].dtype, np.int8)
+        self.assertEqual(store.get("c"), [])
+        self.assertEqual(len(store), 2)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "store", "solutions.json")
+            store = RoomTypesStore(path)
+            store.add("a", [1, 2], 10)
+            store.save()
+            self.assertEqual([chromosome.tolist() for chromosome in RoomTypesStore(path).get("a")], [[1, 2]])
+
+    def test_save_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solutions.json")
+            store = RoomTypesStore(path)
+            store.save_changes()
+            self.assertFalse(os.path.exists(path))
+            store.add("a", [1, 2], 10)
+            store.save_changes()
+            self.assertEqual(len(RoomTypesStore(path)), 1)
+
+            store.add("b", [3], 10)
+            store.save_changes(interval=3600)
+            self.assertEqual(len(RoomTypesStore(path)), 1)
+            store.save_changes()
+            self.assertEqual(len(RoomTypesStore(path)), 2)
+
+            os.remove(path)
+            store.add("b", [3], 10)
+            store.save_changes()
+            self.assertFalse(os.path.exists(path))
+
+
+class WarmStartTest(unittest.TestCase):
+    def setUp(self):
+        self.rooms = Processor("debug.png").get_house().rooms
+
+    def test_signature_follows_the_structure(self):
+        self.assertEqual(get_signature(RoomFeatures(self.rooms)), get_signature(RoomFeatures(self.rooms)))
+        other_rooms = Processor("model2.png").get_house().rooms
+        self.assertNotEqual(get_signature(RoomFeatures(self.rooms)), get_signature(RoomFeatures(other_rooms)))
+
+    def test_heuristic_samples(self):
+        for room in self.rooms:
+            room.type = None
+        samples = sample_rooms_types(self.rooms, 3, np.random.default_rng(1))
+        self.assertEqual(len(samples), 3)
+        for sample in samples:
+            self.assertEqual(list(sample), [room.id for room in self.rooms])
+            self.assertTrue(all(isinstance(room_type, RoomType) for room_type in sample.values()))
+        self.assertTrue(all(room.type is None for room in self.rooms))
+        set_rooms_types(self.rooms)
+        self.assertTrue(all(isinstance(room.type, RoomType) for room in self.rooms))
+
+    def test_runs_start_from_the_stored_solutions(self):
+        ga = RoomTypesGa(0, 10, self.rooms)
+        store = RoomTypesStore()
+        stored = ga.get_random_chromosome()
+        store.add(ga.signature, stored, ga.get_fitness(stored))
+        warm_start_rooms_types(ga, self.rooms, store, samples=2)
+        ga.run()
+        self.assertEqual(len(ga.population), 10)
+        self.assertIn(stored.tolist(), [chromosome.tolist() for chromosome in ga.population])
+        self.assertGreaterEqual(ga.best_fitness, ga.get_fitness(stored))
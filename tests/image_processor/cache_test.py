@@ -0,0 +1,100 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+
+from PIL import Image
+
+from image_processor.cache import HouseCache
+from image_processor.service import Processor
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "..", "debug.png")
+
+
+def summary(house):
+    return [
+        (room.id, room.origin, room.area, room.points, [wall.points for wall in room.walls],
+         [door.inner_margin for door in room.doors], [window.orientation for window in room.windows],
+         sorted(other_room.id for other_room in room.connected_rooms))
+        for room in house.rooms
+    ]
+
+
+class HouseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with open(SCHEMA, "rb") as file:
+            self.content = file.read()
+        self.expected = summary(Processor(self.content).get_house())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_memory_hit_returns_a_new_house(self):
+        cache = HouseCache()
+        first = cache.get_house(self.content)
+        second = cache.get_house(SCHEMA)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(summary(second), self.expected)
+        self.assertIsNot(first.rooms[0], second.rooms[0])
+        self.assertEqual(second.graph.edges(), first.graph.edges())
+
+    def test_disk_hit(self):
+        HouseCache(directory=self.directory.name).get_house(self.content)
+        cache = HouseCache(directory=self.directory.name)
+        house = cache.get_house(self.content)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertEqual(summary(house), self.expected)
+
+    def test_memory_and_disk_eviction(self):
+        cache = HouseCache(directory=self.directory.name, max_entries=1, max_disk_size=1)
+        cache.get_house(self.content)
+        cache.get_house(self.content + b"\0")
+        self.assertLessEqual(len(os.listdir(self.directory.name)), 1)
+        cache.get_house(self.content)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_disk_entries_are_json(self):
+        cache = HouseCache(directory=self.directory.name)
+        key = cache.key(cache._read(self.content)[0])
+        cache.get_house(self.content)
+        with open(cache._path(key)) as file:
+            data = json.load(file)
+        self.assertEqual(data["rooms"][0]["orientation"], "UP")
+
+    def test_pickled_entries_are_not_loaded(self):
+        cache = HouseCache(directory=self.directory.name)
+        key = cache.key(cache._read(self.content)[0])
+        marker = os.path.join(self.directory.name, "unpickled")
+        with open(cache._path(key), "wb") as file:
+            file.write(pickle.dumps(Exploit(marker)))
+        house = cache.get_house(self.content)
+        self.assertFalse(os.path.exists(marker))
+        self.assertEqual(summary(house), self.expected)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_palette_is_part_of_the_key(self):
+        images = list()
+        for palette, transparency in (([0, 0, 0, 255, 255, 255], None), ([255, 255, 255, 0, 0, 0], None),
+                                      ([0, 0, 0, 255, 255, 255], 1)):
+            image = Image.new("P", (4, 4))
+            image.putpalette(palette)
+            if transparency is not None:
+                image.info["transparency"] = transparency
+            images.append(image)
+        cache = HouseCache()
+        keys = {cache.key(cache._read(image)[0]) for image in images}
+        self.assertEqual(len(keys), 3)
+
+
+class Exploit:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return open, (self.path, "w")
+
+
+if __name__ == '__main__':
+    unittest.main()
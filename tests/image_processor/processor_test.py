@@ -0,0 +1,103 @@
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from config.directions import Direction
+from image_processor.service import BadHouseSchema, Processor
+
+
+class ProcessorTest(unittest.TestCase):
+    PLAN = [
+        "........",
+        ".######.",
+        ".#....#.",
+        ".#....b.",
+        ".#....b.",
+        ".##rr##.",
+        ".#....#.",
+        ".######.",
+        "........",
+    ]
+    COLORS = {".": (255, 255, 255), "#": (0, 0, 0), "r": (255, 0, 0), "b": (0, 0, 255)}
+
+    def draw(self, plan):
+        image = Image.new("RGB", (len(plan[0]), len(plan)))
+        for y, row in enumerate(plan):
+            for x, pixel in enumerate(row):
+                image.putpixel((x, y), self.COLORS[pixel])
+        return image
+
+    def setUp(self):
+        image = self.draw(self.PLAN)
+        handle, self.path = tempfile.mkstemp(suffix=".png")
+        os.close(handle)
+        image.save(self.path)
+        self.image = image
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_rooms(self):
+        house = Processor(self.path).get_house()
+        self.assertEqual(len(house.rooms), 2)
+        first, second = house.rooms
+        self.assertEqual((first.origin, first.farthest_point, first.area), ((50, 50), (300, 250), 12))
+        self.assertEqual((second.origin, second.farthest_point, second.area), ((50, 250), (300, 350), 4))
+        self.assertEqual(first.points, [(0, 0), (0, 200), (250, 200), (250, 0)])
+        self.assertEqual(first.connected_rooms, {second})
+
+    def test_structures(self):
+        first, second = Processor(self.path).get_house().rooms
+        self.assertEqual((len(first.walls), len(first.doors), len(first.windows)), (5, 1, 1))
+        self.assertEqual((len(second.walls), len(second.doors), len(second.windows)), (5, 1, 0))
+
+        door = first.doors[0]
+        self.assertEqual(door.points, ((100, 200), (200, 200), (200, 250), (100, 250)))
+        self.assertEqual(door.orientation, Direction.LEFT)
+        self.assertEqual(door.inner_margin, ((100, 200), (200, 200)))
+
+        window = first.windows[0]
+        self.assertEqual(window.points, ((300, 200), (250, 200), (250, 100), (300, 100)))
+        self.assertEqual(window.orientation, Direction.UP)
+        self.assertEqual(window.inner_margin, ((250, 200), (250, 100)))
+
+        self.assertEqual(second.walls[0].points, ((0, 0), (50, 0), (50, 150), (0, 150)))
+
+    def test_in_memory_sources(self):
+        def summary(house):
+            return [(room.origin, room.area, room.points, len(room.walls), len(room.doors), len(room.windows))
+                    for room in house.rooms]
+
+        expected = summary(Processor(self.path).get_house())
+        with open(self.path, "rb") as file:
+            content = file.read()
+        sources = [
+            content,
+            io.BytesIO(content),
+            self.image,
+            np.asarray(self.image),
+            np.asarray(self.image.convert("RGBA")),
+        ]
+        for source in sources:
+            self.assertEqual(summary(Processor(source).get_house()), expected)
+
+    def test_open_outline(self):
+        # the walls only touch diagonally at the top right corner: the room is closed, its outline isn't
+        plan = [
+            "........",
+            ".#####..",
+            ".#....#.",
+            ".#....#.",
+            ".######.",
+            "........",
+        ]
+        with self.assertRaises(BadHouseSchema):
+            Processor(self.draw(plan)).get_house()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from config.materials import Material
+from image_processor._segmentation import _dilate, _segment
+
+B, W, D = Material.BLANK.value, Material.WALL.value, Material.DOOR.value
+
+
+class SegmentationTest(unittest.TestCase):
+    # indexed as [x, y]: an outdoor ring around two rooms joined by a door
+    SCHEMA = np.array([
+        [B, B, B, B, B, B],
+        [B, W, W, W, W, B],
+        [B, W, B, B, W, B],
+        [B, W, W, D, W, B],
+        [B, W, B, B, W, B],
+        [B, W, B, B, W, B],
+        [B, W, W, W, W, B],
+        [B, B, B, B, B, B],
+    ], dtype=np.uint8)
+
+    def test_regions(self):
+        labels, regions = _segment(self.SCHEMA)
+        self.assertEqual(len(regions), 3)
+        outdoor, first, second = regions
+        self.assertEqual(outdoor.first, (0, 0))
+        self.assertEqual(outdoor.area, 24)
+        self.assertEqual((first.first, first.area, first.bbox), ((2, 2), 2, (2, 2, 2, 3)))
+        self.assertEqual((second.first, second.area, second.bbox), ((4, 2), 4, (4, 2, 5, 3)))
+        self.assertTrue(np.array_equal(labels == 0, self.SCHEMA != B))
+
+    def test_dilate(self):
+        mask = np.zeros((4, 5), dtype=bool)
+        mask[0, 1] = True
+        mask[3, 4] = True
+        expected = np.array([
+            [1, 1, 1, 0, 0],
+            [1, 1, 1, 0, 0],
+            [0, 0, 0, 1, 1],
+            [0, 0, 0, 1, 1],
+        ], dtype=bool)
+        self.assertTrue(np.array_equal(_dilate(mask), expected))
+
+    def test_no_blank_pixels(self):
+        labels, regions = _segment(np.full((3, 3), W, dtype=np.uint8))
+        self.assertEqual(regions, [])
+        self.assertFalse(labels.any())
+
+
+if __name__ == '__main__':
+    unittest.main()
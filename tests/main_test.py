@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+import main
+from utils.island_model import IslandModel
+
+ROOM_TYPES_OPTIONS = {"no_generations": 20, "patience": None, "time_limit": None, "islands": 1}
+
+
+def _die(source, *args, **kwargs):
+    os._exit(1)
+
+
+def _forbid_island_processes(island_model):
+    raise AssertionError("islands ran in their own processes")
+
+
+class FindSchemasTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in ("b.png", "a.png", "notes.txt"):
+            open(os.path.join(self.directory, name), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_directories_globs_and_files(self):
+        a, b = os.path.join(self.directory, "a.png"), os.path.join(self.directory, "b.png")
+        self.assertEqual(main.find_schemas([self.directory]), [a, b])
+        self.assertEqual(main.find_schemas([os.path.join(self.directory, "b*")]), [b])
+        self.assertEqual(main.find_schemas([b, self.directory, os.path.join(self.directory, "*.png")]), [b, a])
+        self.assertEqual(main.find_schemas([os.path.join(self.directory, "missing.png")]), [])
+
+
+class RunBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, "out")
+        self.undecodable = os.path.join(self.directory, "undecodable.png")
+        with open(self.undecodable, "w") as file:
+            file.write("not an image")
+        self.bad = os.path.join(self.directory, "bad.png")
+        Image.new("RGB", (20, 20), (0, 0, 0)).save(self.bad)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_batch(self, paths, workers):
+        summary = main.run_batch(paths, self.output, workers, room_types_options=ROOM_TYPES_OPTIONS, seed=7)
+        with open(os.path.join(self.output, "summary.json")) as file:
+            self.assertEqual(json.load(file)["files"], summary["files"])
+        return {os.path.basename(result["file"]): result for result in summary["files"]}
+
+    def test_summary(self):
+        results = self.run_batch(["debug.png", self.undecodable, self.bad], 1)
+        self.assertEqual(results["debug.png"]["status"], "ok")
+        self.assertTrue(os.path.exists(results["debug.png"]["output"]))
+        self.assertEqual(set(results["debug.png"]["timings"]), {"parse", "room_types", "furnish", "draw", "total"})
+        self.assertEqual(results["undecodable.png"]["status"], "failed")
+        self.assertTrue(results["undecodable.png"]["error"].startswith("UnidentifiedImageError"))
+        self.assertEqual(results["bad.png"]["error"], "BadHouseSchema: The house schema isn't valid")
+        self.assertEqual({result["seed"] for result in results.values()}, {7})
+
+    def test_dead_worker_fails_its_job(self):
+        with mock.patch.object(main, "furnish", _die):
+            results = self.run_batch(["debug.png", self.bad], 2)
+        self.assertEqual(results["debug.png"]["status"], "failed")
+        self.assertTrue(results["debug.png"]["error"].startswith("BrokenProcessPool"))
+        self.assertEqual(results["bad.png"]["status"], "failed")
+
+    def test_islands_take_turns_in_workers(self):
+        copy = os.path.join(self.directory, "copy.png")
+        shutil.copy("debug.png", copy)
+        room_types_options = dict(ROOM_TYPES_OPTIONS, islands=2)
+        with mock.patch.object(IslandModel, "_run_in_processes", _forbid_island_processes):
+            summary = main.run_batch(["debug.png", copy], self.output, 2, room_types_options=room_types_options, seed=7)
+        self.assertEqual(summary["workers"], 2)
+        self.assertEqual([result["status"] for result in summary["files"]], ["ok", "ok"])
+
+    def test_schemas_with_the_same_name(self):
+        for name in ("a", "b"):
+            os.makedirs(os.path.join(self.directory, name))
+            shutil.copy("debug.png", os.path.join(self.directory, name, "plan.png"))
+        paths = [os.path.join(self.directory, name, "plan.png") for name in ("a", "b")]
+        summary = main.run_batch(paths, self.output, 1, room_types_options=ROOM_TYPES_OPTIONS, seed=7)
+        outputs = [result["output"] for result in summary["files"]]
+        self.assertEqual(outputs, [os.path.join(self.output, name, "plan_house.png") for name in ("a", "b")])
+        self.assertTrue(all(os.path.exists(output) for output in outputs))
+
+        with self.assertRaises(ValueError):
+            main.run_batch([paths[0], paths[0]], self.output, 1, room_types_options=ROOM_TYPES_OPTIONS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import math
+import unittest
+
+import numpy as np
+
+from maths._collisions import _check_collision
+from maths.domain import Polygon
+from maths.service import PolygonSet, check_collision, check_collision_concave, check_collisions, pack_polygons, rotate
+
+
+def box(x, y, width, height):
+    return Polygon([[x, y], [x, y + height], [x + width, y + height], [x + width, y]])
+
+
+class CheckCollisionTest(unittest.TestCase):
+    def test_boxes_agree_with_separating_axis_test(self):
+        rand = np.random.default_rng(0)
+        for _ in range(500):
+            box1 = box(*rand.integers(0, 20, size=2).tolist(), *rand.integers(1, 10, size=2).tolist())
+            box2 = box(*rand.integers(0, 20, size=2).tolist(), *rand.integers(1, 10, size=2).tolist())
+            self.assertIsNotNone(box1.get_axis_aligned_box())
+            self.assertEqual(check_collision(box1, box2), _check_collision(box1, box2))
+
+    def test_touching_boxes_collide(self):
+        self.assertTrue(check_collision(box(0, 0, 10, 10), box(10, 0, 5, 5)))
+        self.assertTrue(check_collision(box(0, 0, 10, 10), box(10, 10, 5, 5)))
+        self.assertFalse(check_collision(box(0, 0, 10, 10), box(10.5, 0, 5, 5)))
+
+    def test_other_polygons_use_separating_axis_test(self):
+        diamond = Polygon([[5, 0], [10, 5], [5, 10], [0, 5]])
+        self.assertIsNone(diamond.get_axis_aligned_box())
+        self.assertFalse(check_collision(diamond, box(8, 8, 5, 5)))
+        self.assertTrue(check_collision(box(6, 6, 5, 5), diamond))
+
+    def test_quarter_turns_keep_boxes_axis_aligned(self):
+        points = [(3.7, 1.2), (13.7, 1.2), (13.7, 6.2), (3.7, 6.2)]
+        for quarter_turns in range(1, 4):
+            rotated = Polygon([rotate(points[0], point, quarter_turns * math.pi / 2) for point in points])
+            self.assertIsNotNone(rotated.get_axis_aligned_box())
+
+
+class CheckCollisionsTest(unittest.TestCase):
+    def setUp(self):
+        rand = np.random.default_rng(1)
+        self.polygons = list()
+        for _ in range(200):
+            angles = np.sort(rand.uniform(0, 2 * np.pi, rand.integers(3, 8)))
+            self.polygons.append(Polygon(np.round(
+                rand.uniform(0, 20, 2) + rand.uniform(1, 8) * np.stack([np.cos(angles), np.sin(angles)], axis=1), 1)))
+
+    def test_one_against_many(self):
+        expected = [_check_collision(self.polygons[0], polygon) for polygon in self.polygons]
+        self.assertEqual(check_collisions(self.polygons[0], pack_polygons(self.polygons)).tolist(), expected)
+        self.assertEqual(check_collisions(self.polygons, self.polygons[0]).tolist(), expected)
+        self.assertTrue(any(expected) and not all(expected))
+
+    def test_pairs(self):
+        expected = [_check_collision(polygon1, polygon2)
+                    for polygon1, polygon2 in zip(self.polygons[:100], self.polygons[100:])]
+        self.assertEqual(check_collisions(self.polygons[:100], self.polygons[100:]).tolist(), expected)
+
+    def test_concave(self):
+        parts = [box(0, 0, 10, 2), box(0, 2, 2, 8)]
+        self.assertTrue(check_collision_concave(parts, box(2, 2, 1, 1)))
+        self.assertFalse(check_collision_concave(pack_polygons(parts), box(3, 3, 1, 1)))
+        self.assertFalse(check_collision_concave([], box(3, 3, 1, 1)))
+        self.assertEqual(check_collisions(box(3, 3, 1, 1), []).tolist(), [])
+
+
+class PolygonSetTest(unittest.TestCase):
+    def test_collisions_agree_with_check_collision(self):
+        rand = np.random.default_rng(2)
+        polygons = [box(*rand.integers(0, 20, size=4).tolist()) for _ in range(30)]
+        polygons.append(Polygon([[5, 0], [10, 5], [5, 10], [0, 5]]))
+        polygon_set = PolygonSet(polygons)
+        self.assertEqual(len(polygon_set), 31)
+        for other in polygons[:10] + [Polygon([[12, 8], [16, 12], [12, 16], [8, 12]])]:
+            expected = [check_collision(polygon, other) for polygon in polygons]
+            self.assertEqual(polygon_set.collisions(other).tolist(), expected)
+            self.assertEqual(polygon_set.collides(other), any(expected))
+
+    def test_empty_and_frozen(self):
+        polygon_set = PolygonSet([])
+        self.assertFalse(polygon_set.collides(box(0, 0, 1, 1)))
+        with self.assertRaises(ValueError):
+            PolygonSet([box(0, 0, 1, 1)]).packed[0, 0, 0] = 2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from maths.service import OccupancyGrid
+
+
+class OccupancyGridTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = OccupancyGrid((0, 0, 500, 350), 50)
+        self.grid.fill([(0, 0, 50, 350), (52, 52, 117, 213.7)])
+
+    def test_boxes_cover_the_cells_they_overlap(self):
+        self.assertEqual(self.grid.occupied.shape, (10, 7))
+        self.assertTrue(self.grid.occupied[0].all())
+        self.assertEqual(self.grid.occupied[1:3, :].sum(axis=0).tolist(), [0, 2, 2, 2, 2, 0, 0])
+        self.assertFalse(self.grid.occupied[3:].any())
+
+    def test_are_free(self):
+        free = self.grid.are_free([
+            (50, 0, 100, 10),  # only touches the first column
+            (60, 60, 70, 70),
+            (52, 220, 100, 250),
+            (450, 300, 520, 340),  # out of the grid
+            (900, 900, 950, 950),
+            (-900, -900, -850, -850),
+        ])
+        self.assertEqual(free.tolist(), [True, False, False, False, False, False])
+
+    def test_fill_updates_the_table(self):
+        self.assertTrue(self.grid.are_free([(300, 300, 310, 310)])[0])
+        self.grid.fill([(290, 290, 320, 320)])
+        self.assertFalse(self.grid.are_free([(300, 300, 310, 310)])[0])
+
+    def test_large_grid(self):
+        grid = OccupancyGrid((0, 0, 30000, 20000), 10)
+        rand = np.random.default_rng(0)
+        for _ in range(200):
+            corner = rand.uniform(-100, 30000, size=2)
+            grid.fill([(*corner, *(corner + rand.uniform(1, 500, size=2)))])
+        corners = rand.uniform(-100, 30000, size=(500, 2))
+        boxes = np.concatenate([corners, corners + rand.uniform(1, 300, size=(500, 2))], axis=1)
+        expected = list()
+        for min_x, min_y, max_x, max_y in boxes.tolist():
+            cells = grid.occupied[int(min_x // 10):int(np.ceil(max_x / 10)), int(min_y // 10):int(np.ceil(max_y / 10))]
+            expected.append(min_x >= 0 and min_y >= 0 and max_x <= 30000 and max_y <= 20000 and not cells.any())
+        self.assertEqual(grid.are_free(boxes).tolist(), expected)
+        self.assertTrue(any(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from maths.domain import Polygon
+from maths.service import SpatialIndex
+
+
+def square(x, y, size):
+    return Polygon([[x, y], [x + size, y], [x + size, y + size], [x, y + size]])
+
+
+class SpatialIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = SpatialIndex(50)
+        self.index.insert("small", square(10, 10, 20))
+        self.index.insert("large", square(0, 0, 400))
+        self.index.insert("far", square(1000, 1000, 30))
+        self.index.insert("negative", square(-80, -80, 20))
+
+    def test_query_returns_nearby_items_in_insertion_order(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.query(square(20, 20, 5)), ["small", "large"])
+        self.assertEqual(self.index.query(square(300, 300, 10)), ["large"])
+        self.assertEqual(self.index.query(square(990, 990, 20)), ["far"])
+        self.assertEqual(self.index.query(square(-70, -70, 5)), ["negative"])
+        self.assertEqual(self.index.query(square(600, 600, 10)), [])
+
+    def test_touching_items_are_found(self):
+        self.assertIn("far", self.index.query(square(970, 970, 30)))
+        self.assertIn("large", self.index.query(square(400, 400, 10)))
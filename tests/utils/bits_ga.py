@@ -0,0 +1,29 @@
+from utils.genetic_algorithm import GeneticAlgorithm
+
+
+class BitsGa(GeneticAlgorithm):
+    """Toy genetic algorithm the tests share: chromosomes are integers of the given number of bits, their fitness
+    is their number of set bits and evaluations counts how many times it was computed.
+    """
+
+    def __init__(self, bits=8, no_generations=30, no_chromosomes=6, **kwargs):
+        super().__init__(no_generations=no_generations, no_chromosomes=no_chromosomes, **kwargs)
+        self.bits = bits
+        self.evaluations = 0
+
+    def mutate(self, chromosome):
+        return chromosome ^ (1 << int(self.rand.integers(self.bits)))
+
+    def crossover(self, chromosome1, chromosome2):
+        low_bits = (1 << self.bits // 2) - 1
+        return (chromosome1 & low_bits) | (chromosome2 & ~low_bits & ((1 << self.bits) - 1))
+
+    def get_fitness(self, chromosome):
+        self.evaluations += 1
+        return bin(chromosome).count("1")
+
+    def get_random_chromosome(self):
+        return int(self.rand.integers(1 << self.bits))
+
+    def chromosome_key(self, chromosome):
+        return chromosome
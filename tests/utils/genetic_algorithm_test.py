@@ -0,0 +1,72 @@
+import unittest
+
+from bits_ga import BitsGa
+from utils.genetic_algorithm import StopReason
+
+
+class FitnessCacheTest(unittest.TestCase):
+    def test_cached_chromosomes_are_not_evaluated_again(self):
+        ga = BitsGa(bits=4, no_generations=20)
+        self.assertEqual(ga.score([3, 5, 3, 15]), [2, 2, 2, 4])
+        self.assertEqual(ga.score([5, 15, 0]), [2, 4, 0])
+        self.assertEqual(ga.fitness_cache_misses, 5)
+        self.assertEqual(ga.fitness_cache_hits, 2)
+        self.assertEqual(ga.evaluations, 5)
+
+    def test_least_recently_used_chromosomes_are_evicted(self):
+        ga = BitsGa(bits=4, no_generations=20, fitness_cache_size=2)
+        ga.score([1])
+        ga.score([2])
+        ga.score([1])
+        ga.score([4])
+        ga.score([1, 2])
+        self.assertEqual(ga.fitness_cache_hits, 2)
+        self.assertEqual(ga.fitness_cache_misses, 4)
+
+    def test_cache_can_be_disabled(self):
+        ga = BitsGa(bits=4, no_generations=20, fitness_cache_size=0)
+        ga.score([3, 3])
+        self.assertEqual(ga.evaluations, 2)
+        self.assertEqual(ga.fitness_cache_hits + ga.fitness_cache_misses, 0)
+
+    def test_children_are_scored_from_their_parent(self):
+        ga = BitsGa(bits=4, no_generations=20)
+        scored = list()
+        ga.get_child_fitness = lambda child, parent, parent_fitness: scored.append((child, parent, parent_fitness)) or 9
+        self.assertEqual(ga.score_child(7, 3), 9)
+        self.assertEqual(ga.score_child(7, 3), 9)
+        self.assertEqual(scored, [(7, 3, 2)])
+        self.assertEqual(ga.score([7]), [9])
+
+    def test_run_saves_evaluations(self):
+        ga = BitsGa(bits=4, no_generations=20)
+        ga.run()
+        self.assertGreater(ga.fitness_cache_hits, 0)
+        self.assertEqual(ga.evaluations, ga.fitness_cache_misses)
+
+
+class StoppingCriteriaTest(unittest.TestCase):
+    def test_runs_every_generation_by_default(self):
+        ga = BitsGa(bits=4, no_generations=20)
+        ga.run()
+        self.assertEqual(ga.generations, 20)
+        self.assertEqual(ga.stop_reason, StopReason.GENERATIONS)
+
+    def test_stops_at_the_target_fitness(self):
+        ga = BitsGa(bits=4, no_generations=20, target_fitness=0)
+        ga.run()
+        self.assertEqual(ga.generations, 0)
+        self.assertEqual(ga.stop_reason, StopReason.TARGET_FITNESS)
+
+    def test_stops_without_improvement(self):
+        ga = BitsGa(bits=4, no_generations=20, patience=3)
+        ga.no_generations = 1000
+        ga.run()
+        self.assertEqual(ga.stop_reason, StopReason.NO_IMPROVEMENT)
+        self.assertLess(ga.generations, 1000)
+
+    def test_stops_at_the_time_limit(self):
+        ga = BitsGa(bits=4, no_generations=20, time_limit=0)
+        ga.run()
+        self.assertEqual(ga.generations, 0)
+        self.assertEqual(ga.stop_reason, StopReason.TIME_LIMIT)
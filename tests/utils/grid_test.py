@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from config.materials import Material
+from utils.domain import Grid
+
+
+class GridTest(unittest.TestCase):
+    def test_get_set(self):
+        grid = Grid(3, 4, Material.BLANK)
+        self.assertEqual((grid.width, grid.height), (4, 3))
+        grid.set(3, 2, Material.WINDOW)
+        self.assertIs(grid.get(3, 2), Material.WINDOW)
+        self.assertIs(grid.get(0, 0), Material.BLANK)
+        self.assertEqual(grid.array.dtype, np.uint8)
+
+    def test_out_of_range(self):
+        grid = Grid(3, 4)
+        for i, j in [(-1, 0), (0, -1), (4, 0), (0, 3)]:
+            self.assertIsNone(grid.get(i, j))
+        self.assertEqual(grid.get(1, 1), 0)
+
+    def test_view_shares_cells(self):
+        grid = Grid(5, 5, Material.BLANK)
+        view = grid.view(1, 2, 3, 4)
+        self.assertEqual((view.width, view.height, view.offset), (3, 3, (1, 2)))
+        view.set(0, 0, Material.WALL)
+        self.assertIs(grid.get(1, 2), Material.WALL)
+        view[1:, :] = Material.DOOR
+        self.assertTrue((grid[2:4, 2:5] == Material.DOOR.value).all())
+
+    def test_copy_is_independent(self):
+        grid = Grid(2, 2, Material.BLANK)
+        copy = grid.copy()
+        copy.set(0, 0, Material.WALL)
+        self.assertIs(grid.get(0, 0), Material.BLANK)
+        self.assertIs(copy.get(0, 0), Material.WALL)
+
+
+if __name__ == '__main__':
+    unittest.main()
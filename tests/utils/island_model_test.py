@@ -0,0 +1,58 @@
+import unittest
+
+from bits_ga import BitsGa
+from utils.genetic_algorithm import StopReason
+from utils.island_model import IslandModel, get_migration_sources, get_migration_targets
+
+
+class MigrationTargetsTest(unittest.TestCase):
+    def test_topologies(self):
+        self.assertEqual(get_migration_targets("ring", 3), [[1], [2], [0]])
+        self.assertEqual(get_migration_targets("ring", 1), [[]])
+        self.assertEqual(get_migration_targets("complete", 3), [[1, 2], [0, 2], [0, 1]])
+        self.assertEqual(get_migration_targets([[1], [], [0, 1]], 3), [[1], [], [0, 1]])
+        self.assertEqual(get_migration_sources([[1], [], [0, 1]]), [[2], [0, 2], []])
+
+    def test_bad_topologies(self):
+        with self.assertRaises(ValueError):
+            get_migration_targets("star", 3)
+        with self.assertRaises(ValueError):
+            get_migration_targets([[1], [3], [0]], 3)
+
+
+class IslandModelTest(unittest.TestCase):
+    def check_results(self, island_model, best):
+        self.assertEqual(len(island_model.results), 3)
+        self.assertEqual([result.island for result in island_model.results], [0, 1, 2])
+        self.assertEqual(island_model.best_result.best_fitness, max(r.best_fitness for r in island_model.results))
+        self.assertEqual(BitsGa().get_fitness(best), island_model.best_result.best_fitness)
+        for result in island_model.results:
+            self.assertEqual(result.stop_reason, StopReason.GENERATIONS)
+            self.assertEqual(result.generations, 30)
+
+    def test_islands_taking_turns(self):
+        island_model = IslandModel(BitsGa(), islands=3, migration_interval=7, topology="complete", processes=False)
+        self.check_results(island_model, island_model.run())
+
+    def test_islands_in_processes(self):
+        island_model = IslandModel(BitsGa(), islands=3, migration_interval=7, seed=3)
+        self.check_results(island_model, island_model.run())
+        in_turns = IslandModel(BitsGa(), islands=3, migration_interval=7, processes=False, seed=3)
+        in_turns.run()
+        self.assertEqual([result.chromosome for result in island_model.results],
+                         [result.chromosome for result in in_turns.results])
+
+    def test_seeded_islands_are_reproducible(self):
+        runs = [IslandModel(BitsGa(), islands=3, migration_interval=5, processes=False, seed=7) for _ in range(2)]
+        for island_model in runs:
+            island_model.run()
+        self.assertEqual(*[[result.chromosome for result in island_model.results] for island_model in runs])
+        self.assertEqual(runs[0].seed.entropy, 7)
+
+    def test_migrants_replace_the_worst_chromosomes(self):
+        ga = BitsGa()
+        ga.start()
+        ga.immigrate([255])
+        self.assertIn(255, ga.population)
+        self.assertEqual(ga.best_fitness, 8)
+        self.assertEqual(len(ga.population), 6)
@@ -0,0 +1,63 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from bits_ga import BitsGa
+from utils.genetic_algorithm import GenerationObserver
+from utils.telemetry import FIELDS, TelemetryRecorder
+
+
+class EventsObserver(GenerationObserver):
+    def __init__(self):
+        self.events = list()
+
+    def on_start(self, ga):
+        self.events.append("start")
+
+    def on_generation(self, ga, stats):
+        self.events.append(stats["generation"])
+
+    def on_stop(self, ga):
+        self.events.append(ga.stop_reason.value)
+
+
+class TelemetryTest(unittest.TestCase):
+    def test_observers_follow_the_run(self):
+        observer = EventsObserver()
+        ga = BitsGa(no_generations=25, mutation_rate=0.5, observers=[observer])
+        ga.run()
+        self.assertEqual(observer.events, ["start"] + list(range(1, 26)) + ["generations"])
+
+    def test_recorder(self):
+        recorder = TelemetryRecorder()
+        ga = BitsGa(no_generations=25, mutation_rate=0.5, observers=[recorder])
+        ga.run()
+        self.assertEqual([stats["generation"] for stats in recorder.generations], list(range(1, 26)))
+        self.assertEqual(recorder.summary["generations"], 25)
+        self.assertEqual(recorder.summary["best_fitness"], ga.best_fitness)
+        self.assertEqual(recorder.summary["evaluations"],
+                         sum(stats["evaluations"] for stats in recorder.generations))
+        self.assertTrue(0 <= recorder.summary["accepted_children"] <= 1)
+        for stats in recorder.generations:
+            self.assertLessEqual(stats["mean_fitness"], stats["best_fitness"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            recorder.write(os.path.join(directory, "telemetry.csv"))
+            with open(os.path.join(directory, "telemetry.csv")) as file:
+                rows = list(csv.DictReader(file))
+            self.assertEqual(len(rows), 25)
+            self.assertEqual(tuple(rows[0]), FIELDS)
+
+            recorder.write(os.path.join(directory, "telemetry.json"))
+            with open(os.path.join(directory, "telemetry.json")) as file:
+                data = json.load(file)
+            self.assertEqual(data["summary"]["stop_reason"], "generations")
+            self.assertEqual(len(data["generations"]), 25)
+
+    def test_recorder_sampling(self):
+        recorder = TelemetryRecorder(every=10)
+        BitsGa(no_generations=25, mutation_rate=0.5, observers=[recorder]).run()
+        self.assertEqual([stats["generation"] for stats in recorder.generations], [10, 20])
+        self.assertEqual(recorder.summary["generations"], 25)
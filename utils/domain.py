@@ -1,16 +1,74 @@
-class Matrix:
-    def __init__(self, height, width, default=0):
-        self.height = height
-        self.width = width
-        self.matrix = [[default for _ in range(height)] for _ in range(width)]
+from enum import Enum
+
+import numpy as np
+
+
+class Grid:
+    """Two dimensional grid of small values backed by a contiguous uint8 array.
+    Cells are indexed as [i, j] with i < width and j < height. When the default
+    value is an Enum member the grid stores the member values and get returns
+    the members again.
+    """
+
+    def __init__(self, height, width, default=0, kind=None):
+        self.kind = type(default) if kind is None and isinstance(default, Enum) else kind
+        self.array = np.full((width, height), self._encode(default), dtype=np.uint8)
+        self.offset = (0, 0)
+        self._members = self._decode_table(self.kind)
+
+    @classmethod
+    def from_array(cls, array, kind=None, offset=(0, 0)):
+        grid = cls.__new__(cls)
+        grid.kind = kind
+        grid.array = array
+        grid.offset = offset
+        grid._members = cls._decode_table(kind)
+        return grid
+
+    @staticmethod
+    def _decode_table(kind):
+        if kind is None:
+            return None
+        members = [None] * 256
+        for member in kind:
+            members[member.value] = member
+        return members
+
+    @staticmethod
+    def _encode(value):
+        return value.value if isinstance(value, Enum) else value
+
+    @property
+    def width(self):
+        return self.array.shape[0]
+
+    @property
+    def height(self):
+        return self.array.shape[1]
 
     def get(self, i, j):
-        try:
-            if i < 0 or j < 0:
-                return None
-            return self.matrix[i][j]
-        except IndexError:
+        if i < 0 or j < 0 or i >= self.array.shape[0] or j >= self.array.shape[1]:
             return None
+        value = self.array[i, j]
+        return self._members[value] if self._members else int(value)
 
     def set(self, i, j, value):
-        self.matrix[i][j] = value
+        self.array[i, j] = self._encode(value)
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __setitem__(self, index, value):
+        self.array[index] = self._encode(value)
+
+    def view(self, min_i, min_j, max_i, max_j):
+        """Returns a grid sharing the cells of the (inclusive) bounding box."""
+        min_i, min_j = max(min_i, 0), max(min_j, 0)
+        return Grid.from_array(
+            self.array[min_i:max_i + 1, min_j:max_j + 1],
+            self.kind,
+            (self.offset[0] + min_i, self.offset[1] + min_j),
+        )
+
+    def copy(self):
+        return Grid.from_array(self.array.copy(), self.kind, self.offset)
@@ -1,15 +1,78 @@
 import abc
-import random
+import time
+from collections import OrderedDict
+from enum import Enum
+
+import numpy as np
+
+
+class StopReason(Enum):
+    GENERATIONS = "generations"
+    NO_IMPROVEMENT = "no_improvement"
+    TARGET_FITNESS = "target_fitness"
+    TIME_LIMIT = "time_limit"
+    # every possible chromosome was scored, by solvers that don't need to evolve a population
+    EXHAUSTED = "exhausted"
+
+
+class GenerationObserver:
+    """Base of the objects following a genetic algorithm run, every method does nothing by default."""
+
+    def on_start(self, ga):
+        pass
+
+    def on_generation(self, ga, stats):
+        """Called after every generation.
+        Keyword arguments:
+        ga -- the genetic algorithm
+        stats -- dictionary holding the generation number, the best and mean fitness of the population,
+        the fitness evaluations and fitness cache hits of the generation, how many seconds it took and
+        whether its child was mutated and accepted in the population
+        """
+        pass
+
+    def on_stop(self, ga):
+        pass
 
 
 class GeneticAlgorithm(abc.ABC):
-    def __init__(self, no_generations, no_chromosomes, mutation_rate=0.1, mutation_area=0.1, size_of_chromosomes=100):
+    def __init__(self, no_generations, no_chromosomes, mutation_rate=0.1, mutation_area=0.1, size_of_chromosomes=100,
+                 fitness_cache_size=1024, patience=None, target_fitness=None, time_limit=None, rng=None,
+                 observers=None):
+        """Keyword arguments:
+        patience -- stop after this many generations without improving the best fitness
+        target_fitness -- stop as soon as a chromosome reaches this fitness
+        time_limit -- stop once the run took this many seconds
+        rng -- the numpy Generator every random draw comes from, seeded from the OS by default
+        observers -- GenerationObserver instances notified of the progress of every run
+        After a run, generations, stop_reason and best_fitness describe how it went.
+        """
         self.no_generations = no_generations
         self.no_chromosomes = no_chromosomes
         self.size_of_chromosomes = size_of_chromosomes
         self.mutation_rate = mutation_rate
         self.mutation_area = mutation_area
-        self.rand = random.SystemRandom()
+        self.rand = np.random.default_rng() if rng is None else rng
+        self.fitness_cache_size = fitness_cache_size
+        self.fitness_cache_hits = 0
+        self.fitness_cache_misses = 0
+        self.fitness_evaluations = 0
+        self._fitness_cache = OrderedDict()
+        self.patience = patience
+        self.target_fitness = target_fitness
+        self.time_limit = time_limit
+        self.generations = 0
+        self.stop_reason = None
+        self.best_fitness = None
+        self.population = None
+        self._generations_without_improvement = 0
+        self._deadline = None
+        self.observers = list(observers or ())
+        self._initial_chromosomes = list()
+
+    def seed(self, seed):
+        """Restarts the random draws from the given seed (anything numpy.random.default_rng accepts)."""
+        self.rand = np.random.default_rng(seed)
 
     @abc.abstractmethod
     def mutate(self, chromosome):
@@ -27,8 +90,75 @@ class GeneticAlgorithm(abc.ABC):
     def get_random_chromosome(self):
         pass
 
+    def get_random_chromosomes(self, count):
+        return [self.get_random_chromosome() for _ in range(count)]
+
+    def get_fitnesses(self, chromosomes):
+        return [self.get_fitness(chromosome) for chromosome in chromosomes]
+
+    def chromosome_key(self, chromosome):
+        """Returns a hashable value identifying the chromosome, or None when its fitness shouldn't be cached."""
+        return None
+
+    def get_child_fitness(self, child, parent, parent_fitness):
+        """Returns the fitness of a chromosome made from the parent, whose fitness is known.
+        Subclasses able to only score what changed from the parent can override it.
+        """
+        return self.get_fitness(child)
+
+    def _remember_fitness(self, key, fitness):
+        self._fitness_cache[key] = fitness
+        self._fitness_cache.move_to_end(key)
+        while len(self._fitness_cache) > self.fitness_cache_size:
+            self._fitness_cache.popitem(last=False)
+
+    def _cached_fitness(self, key):
+        if key is None or key not in self._fitness_cache:
+            return None
+        self._fitness_cache.move_to_end(key)
+        self.fitness_cache_hits += 1
+        return self._fitness_cache[key]
+
+    def score(self, chromosomes):
+        """Returns the fitness of every chromosome, only evaluating the ones missing from the fitness cache."""
+        if self.fitness_cache_size <= 0:
+            self.fitness_evaluations += len(chromosomes)
+            return self.get_fitnesses(chromosomes)
+        keys = [self.chromosome_key(chromosome) for chromosome in chromosomes]
+        fitnesses = [self._cached_fitness(key) for key in keys]
+        missing = [index for index, fitness in enumerate(fitnesses) if fitness is None]
+        if missing:
+            self.fitness_cache_misses += len(missing)
+            self.fitness_evaluations += len(missing)
+            for index, fitness in zip(missing, self.get_fitnesses([chromosomes[index] for index in missing])):
+                fitnesses[index] = fitness
+                if keys[index] is not None:
+                    self._remember_fitness(keys[index], fitness)
+        return fitnesses
+
+    def score_child(self, child, parent):
+        """Same as score for a single chromosome made from the parent, scored through get_child_fitness."""
+        if self.fitness_cache_size <= 0:
+            self.fitness_evaluations += 1
+            return self.get_fitness(child)
+        key = self.chromosome_key(child)
+        fitness = self._cached_fitness(key)
+        if fitness is None:
+            parent_fitness = self.score([parent])[0]
+            self.fitness_cache_misses += 1
+            self.fitness_evaluations += 1
+            fitness = self.get_child_fitness(child, parent, parent_fitness)
+            if key is not None:
+                self._remember_fitness(key, fitness)
+        return fitness
+
+    def sort_by_fitness(self, chromosomes):
+        fitnesses = self.score(chromosomes)
+        order = sorted(range(len(chromosomes)), key=fitnesses.__getitem__)
+        chromosomes[:] = [chromosomes[index] for index in order]
+
     def choose_one(self, chromosomes):
-        chosen_range_number = self.rand.randrange(1, sum(range(len(chromosomes) + 1)))
+        chosen_range_number = self.rand.integers(1, sum(range(len(chromosomes) + 1)))
         chosen = 0
         while chosen_range_number > 0:
             chosen += 1
@@ -36,28 +166,129 @@ class GeneticAlgorithm(abc.ABC):
         return chromosomes[chosen - 1]
 
     def make_new_generation(self, chromosomes1, chromosomes2):
-        chromosomes1.sort(key=lambda x: self.get_fitness(x))
-        chromosomes2.sort(key=lambda x: self.get_fitness(x))
+        self.sort_by_fitness(chromosomes1)
+        self.sort_by_fitness(chromosomes2)
         best_count = int(50 / 100 * self.no_chromosomes)
         chromosomes = list()
         for i in range(1, best_count + 1):
             chromosomes.append(chromosomes1[self.no_chromosomes - i])
             chromosomes.append(chromosomes2[self.no_chromosomes - i])
-        return chromosomes + self.rand.sample(chromosomes1 + chromosomes2, self.no_chromosomes - 2 * best_count)
+        others = chromosomes1 + chromosomes2
+        chosen = self.rand.choice(len(others), self.no_chromosomes - 2 * best_count, replace=False)
+        return chromosomes + [others[index] for index in chosen]
+
+    def _get_stop_reason(self):
+        if self.target_fitness is not None and self.best_fitness >= self.target_fitness:
+            return StopReason.TARGET_FITNESS
+        if self.patience is not None and self._generations_without_improvement >= self.patience:
+            return StopReason.NO_IMPROVEMENT
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return StopReason.TIME_LIMIT
+        if self.generations >= self.no_generations:
+            return StopReason.GENERATIONS
+        return None
+
+    def _update_best_fitness(self):
+        fitnesses = self.score(self.population)
+        if max(fitnesses) > self.best_fitness:
+            self.best_fitness = max(fitnesses)
+            self._generations_without_improvement = 0
+        else:
+            self._generations_without_improvement += 1
+        return fitnesses
+
+    def _check_stop(self):
+        if self.stop_reason is None:
+            self.stop_reason = self._get_stop_reason()
+            if self.stop_reason is not None:
+                for observer in self.observers:
+                    observer.on_stop(self)
+        return self.stop_reason is not None
+
+    def warm_start(self, chromosomes):
+        """Makes the next runs start from the given chromosomes, random ones completing the first population."""
+        self._initial_chromosomes = list(chromosomes)[:self.no_chromosomes]
+
+    def start(self):
+        """Creates the first population, which evolve then improves."""
+        self._deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+        self.population = self._initial_chromosomes + self.get_random_chromosomes(
+            self.no_chromosomes - len(self._initial_chromosomes))
+        self.generations = 0
+        self.best_fitness = max(self.score(self.population))
+        self._generations_without_improvement = 0
+        self.stop_reason = None
+        for observer in self.observers:
+            observer.on_start(self)
+
+    def _next_generation(self):
+        """Evolves the population by one generation, returns whether its child was mutated and accepted."""
+        new_chromosomes = self.get_random_chromosomes(self.no_chromosomes)
+        chromosomes = self.make_new_generation(self.population, new_chromosomes)
+        mutated = accepted = False
+        for _ in range(1):
+            chromosome_mother = self.choose_one(chromosomes)
+            chromosome_father = self.choose_one(chromosomes)
+            chromosome_child = self.crossover(chromosome_mother, chromosome_father)
+            to_be_mutated = self.mutation_rate >= self.rand.random()
+            if to_be_mutated:
+                chromosome_child = self.mutate(chromosome_child)
+                mutated = True
+            if self.score_child(chromosome_child, chromosome_mother) > self.score([chromosomes[0]])[0]:
+                chromosomes[0] = chromosome_child
+                accepted = True
+        self.population = chromosomes
+        self.generations += 1
+        return mutated, accepted
+
+    def evolve(self, generations=None):
+        """Runs at most the given number of generations (all the remaining ones by default).
+        Returns:
+        True once a stopping criterion is met, stop_reason telling which one.
+        """
+        for _ in range(self.no_generations if generations is None else generations):
+            if self._check_stop():
+                return True
+            if not self.observers:
+                self._next_generation()
+                self._update_best_fitness()
+                continue
+            started, evaluations, hits = time.perf_counter(), self.fitness_evaluations, self.fitness_cache_hits
+            mutated, accepted = self._next_generation()
+            fitnesses = self._update_best_fitness()
+            stats = {
+                "generation": self.generations,
+                "best_fitness": self.best_fitness,
+                "mean_fitness": sum(fitnesses) / len(fitnesses),
+                "evaluations": self.fitness_evaluations - evaluations,
+                "cache_hits": self.fitness_cache_hits - hits,
+                "seconds": time.perf_counter() - started,
+                "mutated": mutated,
+                "accepted": accepted,
+            }
+            for observer in self.observers:
+                observer.on_generation(self, stats)
+        return self._check_stop()
+
+    def best(self, count=1):
+        """Returns the count best chromosomes of the population, the best one last."""
+        self.sort_by_fitness(self.population)
+        return self.population[-count:]
+
+    def immigrate(self, chromosomes):
+        """Replaces the worst chromosomes of the population with the given ones."""
+        count = min(len(chromosomes), self.no_chromosomes - 1)
+        if count <= 0:
+            return
+        self.sort_by_fitness(self.population)
+        self.population[:count] = chromosomes[-count:]
+        best_fitness = max(self.score(self.population))
+        if best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self._generations_without_improvement = 0
 
     def run(self):
-        chromosomes = [self.get_random_chromosome() for _ in range(self.no_chromosomes)]
-        for _ in range(self.no_generations):
-            new_chromosomes = [self.get_random_chromosome() for _ in range(self.no_chromosomes)]
-            chromosomes = self.make_new_generation(chromosomes, new_chromosomes)
-            for _ in range(1):
-                chromosome_mother = self.choose_one(chromosomes)
-                chromosome_father = self.choose_one(chromosomes)
-                chromosome_child = self.crossover(chromosome_mother, chromosome_father)
-                to_be_mutated = self.mutation_rate >= self.rand.random()
-                if to_be_mutated:
-                    chromosome_child = self.mutate(chromosome_child)
-                if self.get_fitness(chromosome_child) > self.get_fitness(chromosomes[0]):
-                    chromosomes[0] = chromosome_child
-        chromosomes.sort(key=lambda x: self.get_fitness(x))
-        return chromosomes[-1]
+        self.start()
+        while not self.evolve():
+            pass
+        return self.best()[-1]
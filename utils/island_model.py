@@ -0,0 +1,177 @@
+import copy
+import multiprocessing
+import queue
+
+import numpy as np
+
+TOPOLOGIES = ("ring", "complete")
+
+
+def get_migration_targets(topology, islands):
+    """Returns, for every island, the islands its best chromosomes migrate to.
+    Keyword arguments:
+    topology -- "ring" (every island sends to the next one), "complete" (every island sends to all the
+    others) or a list holding the target islands of every island
+    islands -- number of islands
+    """
+    if topology == "ring":
+        return [[(island + 1) % islands] if islands > 1 else [] for island in range(islands)]
+    if topology == "complete":
+        return [[other for other in range(islands) if other != island] for island in range(islands)]
+    if isinstance(topology, str):
+        raise ValueError(f"Unknown migration topology {topology}, expected one of {', '.join(TOPOLOGIES)}")
+    if len(topology) != islands or any(not 0 <= target < islands for targets in topology for target in targets):
+        raise ValueError(f"The migration topology must list targets between 0 and {islands - 1} for every island")
+    return [list(targets) for targets in topology]
+
+
+class IslandResult:
+    def __init__(self, island, chromosome, best_fitness, generations, stop_reason):
+        self.island = island
+        self.chromosome = chromosome
+        self.best_fitness = best_fitness
+        self.generations = generations
+        self.stop_reason = stop_reason
+
+
+def _result(island, ga):
+    return IslandResult(island, ga.best()[-1], ga.best_fitness, ga.generations, ga.stop_reason)
+
+
+def get_migration_sources(targets):
+    """Returns, for every island, the islands it receives migrants from, in increasing order."""
+    return [[source for source, source_targets in enumerate(targets) if island in source_targets]
+            for island in range(len(targets))]
+
+
+def _run_island(ga, island, migration_interval, migrants, inboxes, targets, sources, results):
+    """Evolves an island in its own process.
+    Every migration_interval generations the island sends its best chromosomes, or None once it stopped,
+    to its targets and waits for the chromosomes its running sources sent for the same migration, so that
+    migrations happen exactly as when islands take turns.
+    """
+    ga.start()
+    running_sources = list(sources)
+    received = dict()
+    migration = 0
+    while True:
+        stopped = ga.evolve(migration_interval)
+        best = None if stopped else ga.best(migrants)
+        for target in targets:
+            inboxes[target].put((island, migration, best))
+        if stopped:
+            break
+        arrivals = list()
+        for source in list(running_sources):
+            while (source, migration) not in received:
+                sender, sent_migration, chromosomes = inboxes[island].get()
+                received[(sender, sent_migration)] = chromosomes
+            chromosomes = received.pop((source, migration))
+            if chromosomes is None:
+                running_sources.remove(source)
+            else:
+                arrivals += chromosomes
+        if arrivals:
+            ga.immigrate(arrivals)
+        migration += 1
+    # migrants nobody will read anymore mustn't keep the process alive
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    results.put(_result(island, ga))
+
+
+class IslandModel:
+    """Runs several populations of a genetic algorithm, the islands, that regularly exchange their best chromosomes.
+    Every island is a copy of the given genetic algorithm, with its own stopping criteria and random generator,
+    seeded from a seed sequence spawned from seed (the seed used is kept in seed to reproduce the run).
+    Islands run in separate processes unless processes is False, which callers already running in several
+    processes (like the workers of a pool) should pass, or the current process is daemonic and can't have
+    children; they then take turns in the current process. Both ways give the same result for the same seed,
+    unless a time limit stops the islands.
+    Keyword arguments:
+    ga -- the configured genetic algorithm every island copies, it must be picklable
+    islands -- number of islands
+    migration_interval -- generations between two migrations
+    migrants -- number of chromosomes an island sends on every migration
+    topology -- which islands migrants are sent to, see get_migration_targets
+    processes -- whether islands may run in their own process
+    seed -- an integer or a numpy SeedSequence, drawn from the OS by default
+    """
+
+    def __init__(self, ga, islands=4, migration_interval=50, migrants=1, topology="ring", processes=True,
+                 seed=None):
+        self.ga = ga
+        self.seed = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.targets = get_migration_targets(topology, islands)
+        self.sources = get_migration_sources(self.targets)
+        self.processes = processes
+        self.results = list()
+
+    @property
+    def best_result(self):
+        return max(self.results, key=lambda result: result.best_fitness) if self.results else None
+
+    def _make_islands(self):
+        islands = list()
+        for seed in self.seed.spawn(self.islands):
+            island = copy.deepcopy(self.ga)
+            island.seed(seed)
+            islands.append(island)
+        return islands
+
+    def run(self):
+        """Returns the best chromosome found by any island, results describing every island."""
+        if self.processes and self.islands > 1 and not multiprocessing.current_process().daemon:
+            self.results = self._run_in_processes()
+        else:
+            self.results = self._run_in_turns()
+        return self.best_result.chromosome
+
+    def _run_in_turns(self):
+        islands = self._make_islands()
+        for ga in islands:
+            ga.start()
+        running = list(range(self.islands))
+        while running:
+            running = [island for island in running if not islands[island].evolve(self.migration_interval)]
+            outgoing = {island: islands[island].best(self.migrants) for island in running}
+            for island in running:
+                arrivals = [chromosome for source in self.sources[island] if source in outgoing
+                            for chromosome in outgoing[source]]
+                if arrivals:
+                    islands[island].immigrate(arrivals)
+        return [_result(island, ga) for island, ga in enumerate(islands)]
+
+    def _run_in_processes(self):
+        context = multiprocessing.get_context()
+        inboxes = [context.Queue() for _ in range(self.islands)]
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=_run_island,
+                args=(ga, island, self.migration_interval, self.migrants, inboxes, self.targets[island],
+                      self.sources[island], results),
+                daemon=True,
+            )
+            for island, ga in enumerate(self._make_islands())
+        ]
+        for worker in workers:
+            worker.start()
+        island_results = list()
+        try:
+            while len(island_results) < len(workers):
+                try:
+                    island_results.append(results.get(timeout=0.1))
+                except queue.Empty:
+                    failed = [island for island, worker in enumerate(workers) if worker.exitcode not in (None, 0)]
+                    if failed:
+                        raise RuntimeError(f"Island {failed[0]} exited with code {workers[failed[0]].exitcode}")
+        finally:
+            for worker in workers:
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+        return sorted(island_results, key=lambda result: result.island)
@@ -0,0 +1,69 @@
+import csv
+import json
+import time
+
+from utils.genetic_algorithm import GenerationObserver
+
+FIELDS = ("generation", "best_fitness", "mean_fitness", "evaluations", "cache_hits", "seconds", "mutated", "accepted")
+
+
+class TelemetryRecorder(GenerationObserver):
+    """Keeps the statistics of every generation of the last run of the genetic algorithm it observes.
+    Once the run stops, summary holds its totals, the share of children that were mutated and accepted
+    in the population, and the settings they came from.
+    Keyword arguments:
+    every -- only keep one generation out of every, the summary still covering all of them
+    """
+
+    def __init__(self, every=1):
+        self.every = every
+        self.generations = list()
+        self.summary = dict()
+        self._started = None
+        self._totals = dict()
+
+    def on_start(self, ga):
+        self.generations = list()
+        self.summary = dict()
+        self._started = time.perf_counter()
+        self._totals = {"generations": 0, "evaluations": 0, "cache_hits": 0, "mutated": 0, "accepted": 0}
+
+    def on_generation(self, ga, stats):
+        self._totals["generations"] += 1
+        for field in ("evaluations", "cache_hits", "mutated", "accepted"):
+            self._totals[field] += stats[field]
+        if stats["generation"] % self.every == 0:
+            self.generations.append(stats)
+
+    def on_stop(self, ga):
+        generations = self._totals["generations"]
+        self.summary = {
+            "generations": generations,
+            "stop_reason": ga.stop_reason.value,
+            "best_fitness": ga.best_fitness,
+            "seconds": time.perf_counter() - self._started,
+            "evaluations": self._totals["evaluations"],
+            "cache_hits": self._totals["cache_hits"],
+            "mutated_children": self._totals["mutated"] / generations if generations else 0,
+            "accepted_children": self._totals["accepted"] / generations if generations else 0,
+            "no_chromosomes": ga.no_chromosomes,
+            "mutation_rate": ga.mutation_rate,
+            "mutation_area": ga.mutation_area,
+        }
+
+    def write_csv(self, path):
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.generations)
+
+    def write_json(self, path):
+        with open(path, "w") as file:
+            json.dump({"summary": self.summary, "generations": self.generations}, file, indent=2)
+
+    def write(self, path):
+        """Writes the generations as CSV when the path ends with .csv, and everything as JSON otherwise."""
+        if path.endswith(".csv"):
+            self.write_csv(path)
+        else:
+            self.write_json(path)